@@ -37,6 +37,7 @@ a = Analysis(
         'ttkbootstrap.constants',
         'ttkbootstrap.validation',
         'ttkbootstrap.dialogs',
+        'ttkbootstrap.toast',
         'tkinterdnd2',
         'tkdnd'
     ],
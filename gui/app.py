@@ -11,21 +11,39 @@
 import tkinter as tk
 import os
 import base64
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from tkinter import messagebox
-from tkinterdnd2 import DND_FILES, TkinterDnD
+from tkinterdnd2 import TkinterDnD
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+from ttkbootstrap.toast import ToastNotification
 
-from gui.file_panel import FilePanel
-from gui.link_panel import LinkPanel
-from gui.tree_view import TreeView
-from gui.link_viewer import LinkViewer
 from models.json_data import JsonData
+from utils.json_handler import fix_json_fields, write_json_file
+from utils.file_sorter import check_and_sort_json_file
+from utils.link_parser import LinkParser
+
+
+@lru_cache(maxsize=1)
+def _decoded_icon():
+    """解码内置的base64图标，只在首次使用时解码一次"""
+    from resources.icon_date import icon_data
+    return base64.b64decode(icon_data.strip())
 
 
 class App:
     """123云盘秒链JSON管理器应用程序类"""
     
+    # 内置图标加载失败时依次尝试的图标文件
+    ICON_CANDIDATES = (("resources", "icn.png"), ("old", "icn.png"))
+    # 已找到的图标文件路径，供后续实例直接使用
+    _icon_path = None
+    # 后台保存结果的轮询间隔（毫秒），空闲时逐步加倍
+    SAVE_POLL_MIN = 20
+    SAVE_POLL_MAX = 200
+    
     def __init__(self, root):
         """
         初始化应用程序
@@ -44,15 +62,43 @@ class App:
         
         # 初始化数据模型
         self.json_data = None
+        self._current_file = None
+        self._current_basename = None
         self.current_file = None
         self.init_json_data()
         
+        # 后台保存：单线程写入，写入期间的新保存请求按文件合并为最新快照
+        self._save_executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_save = None
+        self._queued_saves = {}
+        self._save_poll_delay = self.SAVE_POLL_MIN
+        self._save_poll_id = None
+        # 本程序最近一次读写各文件后的修改时间，用于判断内存数据是否与磁盘一致
+        self._known_mtimes = {}
+        # 后台合并任务，读取同样排在写入线程中，保证读到已写完的文件
+        self._pending_merge = None
+        self._merge_poll_delay = self.SAVE_POLL_MIN
+        
         # 创建GUI组件
         self.create_gui()
         
+        # 关闭窗口前先写完未完成的保存
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # 程序启动后检查文件是否存在
         self.root.after(500, self.check_all_files_exist)
     
+    @property
+    def current_file(self):
+        """当前加载的JSON文件路径"""
+        return self._current_file
+    
+    @current_file.setter
+    def current_file(self, value):
+        self._current_file = value
+        # 文件名只在路径变化时计算一次
+        self._current_basename = os.path.basename(value) if value else None
+    
     def init_json_data(self):
         """初始化JSON数据模型"""
         if self.json_data is None:
@@ -81,29 +127,24 @@ class App:
         """设置窗口图标"""
         try:
             # 首先尝试使用base64内置图标
-            from resources.icon_date import icon_data
-            import base64
-            from io import BytesIO
-            
-            # 解码base64数据
-            img_data = base64.b64decode(icon_data.strip())
+            img_data = _decoded_icon()
             self.icon = tk.PhotoImage(data=img_data)
             self.root.iconphoto(True, self.icon)
             
         except Exception as e:
             print(f"无法加载内置图标: {str(e)}")
             try:
-                # 如果base64图标加载失败，尝试从resources目录加载图标文件
-                icon_path = os.path.join("resources", "icn.png")
-                if os.path.exists(icon_path):
+                # 如果base64图标加载失败，依次尝试resources、old目录下的图标文件
+                icon_path = App._icon_path
+                if icon_path is None:
+                    for parts in self.ICON_CANDIDATES:
+                        candidate = os.path.join(*parts)
+                        if os.path.exists(candidate):
+                            icon_path = App._icon_path = candidate
+                            break
+                if icon_path:
                     self.icon = tk.PhotoImage(file=icon_path)
                     self.root.iconphoto(True, self.icon)
-                else:
-                    # 如果找不到图标文件，尝试从old目录加载
-                    old_icon_path = os.path.join("old", "icn.png")
-                    if os.path.exists(old_icon_path):
-                        self.icon = tk.PhotoImage(file=old_icon_path)
-                        self.root.iconphoto(True, self.icon)
             except Exception as e:
                 print(f"无法加载图标文件: {str(e)}")
     
@@ -111,6 +152,11 @@ class App:
         """
         创建GUI组件
         """
+        # 面板模块在创建界面时才导入
+        from gui.file_panel import FilePanel
+        from gui.link_panel import LinkPanel
+        from gui.tree_view import TreeView
+        
         # 创建主框架
         main_frame = ttk.Frame(self.root, padding="5")
         main_frame.pack(fill=BOTH, expand=True, pady=(5, 0))
@@ -138,6 +184,131 @@ class App:
         """检查所有文件是否存在，移除不存在的文件"""
         self.file_panel.check_all_files_exist()
     
+    def schedule_save(self):
+        """
+        在后台线程保存当前文件
+        
+        保存前先在主线程生成数据快照；若后台正在写入，只记录该文件最新的快照，
+        待写入完成后再提交，避免连续添加时重复写盘。
+        """
+        if not self.current_file or not self.json_data:
+            return
+        data = self.json_data.snapshot()
+        if data is None:
+            return
+        future = self._pending_save
+        if future is not None:
+            if not future.done():
+                self._queued_saves[self.current_file] = data
+                return
+            # 上一次保存已完成但还没轮询到，先报告结果，避免被新的保存覆盖
+            self._pending_save = None
+            self._report_save_result(future)
+        self._start_save(self.current_file, data)
+    
+    def _submit_save(self, filepath, data):
+        """提交保存任务，同一文件排队中的旧快照随之作废"""
+        self._queued_saves.pop(filepath, None)
+        return self._save_executor.submit(self._write_snapshot, filepath, data)
+    
+    def _write_snapshot(self, filepath, data):
+        """写入快照，成功后记录文件的修改时间"""
+        result = write_json_file(filepath, data)
+        if result[0]:
+            self._remember_mtime(filepath)
+        return result
+    
+    def _remember_mtime(self, filepath):
+        """记录文件当前的修改时间"""
+        try:
+            self._known_mtimes[filepath] = os.stat(filepath).st_mtime_ns
+        except OSError:
+            self._known_mtimes.pop(filepath, None)
+    
+    def get_loaded_data(self, filepath):
+        """
+        获取已加载到内存中的文件数据，避免重复读取和解析
+        
+        调用前应先flush_saves()。只有该文件是当前文件，且磁盘上的修改时间与本程序
+        最近一次读写时一致（未被外部修改）时才返回内存数据。
+        注意内存数据中各文件的size已转为整数，磁盘上可能仍是字符串，
+        从磁盘读取的调用方需自行统一
+        
+        Args:
+            filepath: JSON文件路径
+            
+        Returns:
+            Optional[dict]: 内存中的数据，不可用时返回None
+        """
+        if filepath != self.current_file or not self.json_data or not self.json_data.data:
+            return None
+        try:
+            mtime = os.stat(filepath).st_mtime_ns
+        except OSError:
+            return None
+        if self._known_mtimes.get(filepath) != mtime:
+            return None
+        return self.json_data.data
+    
+    def _start_save(self, filepath, data):
+        """提交保存任务并开始轮询结果"""
+        self._pending_save = self._submit_save(filepath, data)
+        self._save_poll_delay = self.SAVE_POLL_MIN
+        # 只保留一条轮询，重新开始时取消上一次的
+        if self._save_poll_id is not None:
+            self.root.after_cancel(self._save_poll_id)
+        self._save_poll_id = self.root.after(self._save_poll_delay, self._check_save_result)
+    
+    def _check_save_result(self):
+        """轮询后台保存结果，出错时提示用户"""
+        self._save_poll_id = None
+        future = self._pending_save
+        if future is None:
+            return
+        if not future.done():
+            self._save_poll_delay = min(self._save_poll_delay * 2, self.SAVE_POLL_MAX)
+            self._save_poll_id = self.root.after(self._save_poll_delay, self._check_save_result)
+            return
+        self._pending_save = None
+        self._report_save_result(future)
+        if self._queued_saves:
+            filepath, data = next(iter(self._queued_saves.items()))
+            self._start_save(filepath, data)
+    
+    def _report_save_result(self, future):
+        """报告已完成的保存任务，出错时提示用户"""
+        success, message = future.result()
+        if not success:
+            self.show_error_toast("保存失败", f"保存文件时出错: {message}")
+    
+    def flush_saves(self):
+        """等待后台保存完成，并写入所有排队中的快照"""
+        future, self._pending_save = self._pending_save, None
+        results = [future.result()] if future is not None else []
+        while self._queued_saves:
+            filepath, data = self._queued_saves.popitem()
+            results.append(self._write_snapshot(filepath, data))
+        for success, message in results:
+            if not success:
+                messagebox.showerror("保存失败", f"保存文件时出错: {message}")
+    
+    def show_error_toast(self, title, message):
+        """
+        以不阻塞事件循环的提示框显示错误，多个提示依次弹出
+        
+        Args:
+            title: 标题
+            message: 错误信息
+        """
+        ToastNotification(title=title, message=message, duration=3000, bootstyle="danger").show_toast()
+    
+    def on_close(self):
+        """关闭窗口"""
+        self.flush_saves()
+        self.file_panel.persist_file_list()
+        self._save_executor.shutdown()
+        self.root.destroy()
+    
     def load_json_file(self, filepath):
         """
         加载JSON文件
@@ -145,11 +316,12 @@ class App:
         Args:
             filepath: JSON文件路径
         """
+        # 先写完未完成的保存，避免读到旧内容
+        self.flush_saves()
         self.init_json_data()
         success, message = self.json_data.load(filepath)
         # 自动补全统计字段
         try:
-            from utils.json_handler import fix_json_fields
             if hasattr(self.json_data, 'data') and isinstance(self.json_data.data, dict):
                 fixed, _ = fix_json_fields(self.json_data.data)
                 self.json_data.data = fixed
@@ -157,26 +329,28 @@ class App:
             print(f"[fix_json_fields] 补全统计字段异常: {e}")
         if success:
             self.current_file = filepath
+            self._remember_mtime(filepath)
             
             # 更新树形视图
-            self.tree_view.reset_view()
-            self.tree_view.update_view()
+            self.tree_view.freeze()
+            try:
+                self.tree_view.reset_view()
+                self.tree_view.update_view()
+            finally:
+                self.tree_view.thaw()
         else:
-            messagebox.showerror("错误", f"无法加载文件: {message}")
+            self.show_error_toast("错误", f"无法加载文件: {message}")
     
-    def add_link(self, link, batch_mode=False):
+    def add_link(self, link):
         """
-        添加新链接
+        添加新链接，多个链接由parse_links和add_parsed_files批量处理
         
         Args:
             link: 123FSLink格式的链接字符串
-            batch_mode: 是否为批量处理模式，批量模式下不会立即更新UI和保存文件
             
         Returns:
             Tuple[bool, str, int]: (是否成功, 消息, 添加的文件数)
         """
-        from utils.link_parser import LinkParser
-        
         # 解析链接
         files, error_msg = LinkParser.parse_link(link)
         
@@ -194,68 +368,79 @@ class App:
         # 添加新文件
         added_count = self.json_data.add_files(files)
         
-        # 如果不是批量模式，则立即保存和更新UI
-        if not batch_mode:
-            # 保存文件
-            success, message = self.json_data.save(self.current_file)
-            
-            if not success:
-                return False, message, 0
-            
-            # 更新树形视图
-            self.tree_view.reset_view()
-            self.tree_view.update_view()
-            
-            # 如果是新文件，添加到文件列表
-            if self.current_file:
-                filename = os.path.basename(self.current_file)
-                self.file_panel.add_file_to_list(filename, self.current_file)
+        # 在后台保存文件
+        self.schedule_save()
+        
+        # 更新树形视图，只增删有变化的行
+        self.tree_view.update_view()
+        
+        # 如果是新文件，添加到文件列表
+        if self.current_file:
+            self.file_panel.add_file_to_list(self._current_basename, self.current_file)
         
         return True, f"已添加 {added_count} 个新链接", added_count
     
-    def batch_add_links(self, links):
+    @staticmethod
+    def parse_links(links, start=0):
         """
-        批量添加多个链接
+        解析多个链接并汇总文件信息，不访问界面和当前数据，可在后台线程调用
         
         Args:
             links: 链接列表
+            start: 第一个链接的序号偏移，用于分批解析时错误信息中的编号
             
         Returns:
-            Tuple[int, int, list]: (成功数, 总数, 错误信息列表)
+            Tuple[int, list, list]: (成功数, 错误信息列表, 文件信息列表)
         """
         success_count = 0
-        total_count = len(links)
         error_messages = []
-        total_files_added = 0
+        all_files = []
         
-        # 批量处理所有链接
-        for i, link in enumerate(links):
-            success, message, added_count = self.add_link(link, batch_mode=True)
+        for i, link in enumerate(links, start + 1):
+            files, error_msg = LinkParser.parse_link(link)
             
-            if success:
-                success_count += 1
-                total_files_added += added_count
+            if error_msg:
+                error_messages.append(f"链接 {i}: {error_msg}")
+            elif not files:
+                error_messages.append(f"链接 {i}: 未能从链接中解析出任何有效文件信息")
             else:
-                error_messages.append(f"链接 {i+1}: {message}")
+                success_count += 1
+                all_files.extend(files)
         
-        # 批量处理完成后，保存文件并更新UI
-        if success_count > 0:
-            # 保存文件
-            success, message = self.json_data.save(self.current_file)
-            
-            if not success:
-                error_messages.append(f"保存文件失败: {message}")
+        return success_count, error_messages, all_files
+    
+    def add_parsed_files(self, all_files):
+        """
+        一次性添加已解析的文件，在后台保存并更新UI，只能在主线程调用
+        
+        Args:
+            all_files: parse_links返回的文件信息列表
             
-            # 更新树形视图
-            self.tree_view.reset_view()
+        Returns:
+            int: 添加的文件数
+        """
+        # 如果没有加载任何JSON文件，创建新的
+        if not self.json_data.data or 'files' not in self.json_data.data:
+            self.current_file = self.json_data.create_new()
+        
+        # 一次性添加所有文件
+        total_files_added = self.json_data.add_files_bulk(all_files)
+        
+        # 在后台保存文件，出错时以提示框显示
+        self.schedule_save()
+        
+        # 更新树形视图，只增删有变化的行
+        self.tree_view.freeze()
+        try:
             self.tree_view.update_view()
-            
-            # 如果是新文件，添加到文件列表
-            if self.current_file:
-                filename = os.path.basename(self.current_file)
-                self.file_panel.add_file_to_list(filename, self.current_file)
+        finally:
+            self.tree_view.thaw()
+        
+        # 如果是新文件，添加到文件列表
+        if self.current_file:
+            self.file_panel.add_file_to_list(self._current_basename, self.current_file)
         
-        return success_count, total_count, error_messages, total_files_added
+        return total_files_added
     
     def export_selected_links(self, selected_files):
         """
@@ -267,17 +452,28 @@ class App:
         Returns:
             str: 生成的链接
         """
-        from utils.link_parser import LinkParser
-        
         # 生成123FSLinkV2格式的链接
         link = LinkParser.generate_link(selected_files)
         
         # 复制到剪贴板
-        self.root.clipboard_clear()
-        self.root.clipboard_append(link)
+        self.copy_to_clipboard(link)
         
         return link
     
+    def copy_to_clipboard(self, text):
+        """
+        复制文本到剪贴板
+        
+        直接调用Tcl的clipboard命令，省去tkinter包装层的参数处理，
+        批量导出时整段文本只需一次append
+        
+        Args:
+            text: 要复制的文本
+        """
+        tk_call = self.root.tk.call
+        tk_call('clipboard', 'clear')
+        tk_call('clipboard', 'append', '--', text)
+    
     def sort_current_file(self):
         """
         排序当前文件
@@ -288,7 +484,7 @@ class App:
         if not self.current_file:
             return False, "没有加载任何JSON文件"
         
-        from utils.file_sorter import check_and_sort_json_file
+        self.flush_saves()
         needs_sort, success, message = check_and_sort_json_file(self.current_file)
         
         if needs_sort and success:
@@ -300,52 +496,93 @@ class App:
         else:
             return False, f"排序失败: {message}"
     
-    def merge_files(self, filepaths):
+    def submit_write(self, fn, args, on_done):
+        """
+        在写入线程执行其他写盘任务，与保存按顺序执行，关闭窗口时会等待写完
+        
+        Args:
+            fn: 写盘函数
+            args: 传给fn的参数元组
+            on_done: 完成后在主线程调用，参数为fn抛出的异常，成功时为None
+        """
+        future = self._save_executor.submit(fn, *args)
+        self.root.after(self.SAVE_POLL_MIN, self._poll_write_future, future, on_done, self.SAVE_POLL_MIN)
+    
+    def _poll_write_future(self, future, on_done, delay):
+        """轮询写盘任务，完成后在主线程回调"""
+        if not future.done():
+            delay = min(delay * 2, self.SAVE_POLL_MAX)
+            self.root.after(delay, self._poll_write_future, future, on_done, delay)
+            return
+        on_done(future.exception())
+    
+    def merge_files(self, filepaths, on_done):
         """
-        合并多个JSON文件
+        在后台线程读取并合并多个JSON文件，完成后在主线程显示合并结果
         
         Args:
             filepaths: JSON文件路径列表
+            on_done: 合并结束后在主线程调用，参数为(是否成功, 消息, 合并后的文件名)
             
         Returns:
-            Tuple[bool, str, str]: (是否成功, 消息, 合并后的文件名)
+            Tuple[bool, str]: (是否已开始合并, 消息)
         """
         if len(filepaths) < 2:
-            return False, "请选择至少两个文件进行合并", ""
+            return False, "请选择至少两个文件进行合并"
+        if self._pending_merge is not None:
+            return False, "正在合并，请稍候"
+        
+        self.flush_saves()
+        future = self._save_executor.submit(JsonData.merge_json_files, filepaths)
+        self._pending_merge = (future, on_done)
+        self._merge_poll_delay = self.SAVE_POLL_MIN
+        self.root.after(self._merge_poll_delay, self._poll_merge_future)
+        return True, "正在合并"
+    
+    def _poll_merge_future(self):
+        """轮询后台合并结果，完成后在主线程更新视图并回调"""
+        if self._pending_merge is None:
+            return
+        future, on_done = self._pending_merge
+        if not future.done():
+            self._merge_poll_delay = min(self._merge_poll_delay * 2, self.SAVE_POLL_MAX)
+            self.root.after(self._merge_poll_delay, self._poll_merge_future)
+            return
+        self._pending_merge = None
         
         try:
-            # 合并文件
-            merged_data, total_added = JsonData.merge_json_files(filepaths)
+            merged_data, total_added = future.result()
             
             if not merged_data:
-                return False, "合并文件失败，无法读取文件数据", ""
+                on_done(False, "合并文件失败，无法读取文件数据", "")
+                return
             
             # 创建新的JsonData实例
             self.json_data = JsonData()
             self.json_data.data = merged_data
+            self.json_data.files = merged_data['files']
             
-            # 生成新文件名并保存
-            from datetime import datetime
+            # 生成新文件名
             timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
             merged_filename = f"123FastLink_merged_{timestamp}.json"
             
-            success, message = self.json_data.save(merged_filename)
-            
-            if not success:
-                return False, f"保存合并文件失败: {message}", ""
-            
-            # 更新当前文件
+            # 更新当前文件并在后台保存
             self.current_file = merged_filename
+            self.schedule_save()
             
             # 更新树形视图
-            self.tree_view.reset_view()
-            self.tree_view.update_view()
-            
-            return True, f"文件已合并，共合并了 {total_added} 个新链接", merged_filename
+            self.tree_view.freeze()
+            try:
+                self.tree_view.reset_view()
+                self.tree_view.update_view()
+            finally:
+                self.tree_view.thaw()
             
         except Exception as e:
-            return False, f"合并文件时出错: {str(e)}", ""
-
+            on_done(False, f"合并文件时出错: {str(e)}", "")
+            return
+        
+        on_done(True, f"文件已合并，共合并了 {total_added} 个新链接", merged_filename)
 
 def main():
     """应用程序入口点"""
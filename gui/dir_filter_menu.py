@@ -1,30 +1,103 @@
-import re
+from sys import intern
+
 
 class DirFilterMenu:
     """
     目录筛选与多级下拉菜单生成工具
     """
-    def __init__(self, files):
+    # 每次筛选刷新都可能重建实例，使用__slots__省去实例字典
+    __slots__ = ('files', '_heads', '_shorten', '_by_second', '_by_second_third',
+                 '_sorted_thirds', '_dir_tree')
+
+    def __init__(self, files, shorten=False, max_len=7):
         self.files = files or []
-        self.dir_tree = self._build_dir_tree()
+        self._dir_tree = None
+        # 预先切分出每个文件所在目录的前两段，与files一一对应
+        self._heads = [self._dir_head(f.get('path', '')) for f in self.files]
+        # 目录名省略规则，默认不省略
+        if shorten:
+            self._shorten = lambda name: name[:max_len] + '...' if len(name) > max_len else name
+        else:
+            self._shorten = lambda name: name
+        self._build_dir_tree()
 
     def _build_dir_tree(self):
         """
-        构建二级、三级目录树结构
+        一次遍历文件列表，按二级目录、二级/三级目录预先分桶
+        _by_second: {二级目录: [文件]}
+        _by_second_third: {'二级/三级': [文件]}，路径恰为'二级/三级'的文件也归入该桶
+        """
+        by_second = {}
+        by_second_third = {}
+        # 只有一层目录的文件，路径可能恰好与某个'二级/三级'相同
+        shallow = False
+        for f, (second, key) in zip(self.files, self._heads):
+            if second is None:
+                continue
+            by_second.setdefault(second, []).append(f)
+            if key is not None:
+                by_second_third.setdefault(key, []).append(f)
+            else:
+                shallow = True
+        if shallow:
+            self._add_exact_paths(by_second_third)
+        self._by_second = by_second
+        self._by_second_third = by_second_third
+        # 三级目录在构建时排好序，生成菜单时无需再排序
+        thirds = {second: [] for second in by_second}
+        for key in by_second_third:
+            second, _, third = key.partition('/')
+            thirds[second].append(third)
+        self._sorted_thirds = {second: tuple(sorted(t)) for second, t in thirds.items()}
+
+    def _add_exact_paths(self, by_second_third):
+        """
+        路径恰为'二级/三级'的文件也属于该筛选项，按原文件顺序重建受影响的桶
+        """
+        affected = {f.get('path', '') for f, (second, key) in zip(self.files, self._heads)
+                    if second is not None and key is None and f.get('path', '') in by_second_third}
+        if not affected:
+            return
+        for key in affected:
+            by_second_third[key] = []
+        for f, (second, key) in zip(self.files, self._heads):
+            if key in affected:
+                by_second_third[key].append(f)
+            elif second is not None and key is None:
+                path = f.get('path', '')
+                if path in affected:
+                    by_second_third[path].append(f)
+
+    @staticmethod
+    def _dir_head(path):
+        """
+        取文件所在目录的前两段，用partition切分，不生成完整的分段列表
+        返回：(二级目录 | None, '二级/三级' | None)
+        以'/'开头的路径二级目录为空字符串；三级目录为空（如'a//x'）时不分三级桶
+        """
+        directory, sep, _ = path.rpartition('/')
+        if not sep:
+            return None, None
+        second, sep, rest = directory.partition('/')
+        # 同名目录大量重复，驻留后各文件共用同一字符串对象，字典查找可走身份比较
+        second = intern(second)
+        if not sep:
+            return second, None
+        third = rest.partition('/')[0]
+        if not third:
+            return second, None
+        # 直接切片得到'二级/三级'桶键，省去逐个文件拼接字符串
+        return second, intern(directory[:len(second) + 1 + len(third)])
+
+    @property
+    def dir_tree(self):
+        """
+        二级、三级目录树结构，首次访问时由分桶结果生成
         返回：{二级目录: set(三级目录)}
         """
-        tree = {}
-        for f in self.files:
-            path = f.get('path', '')
-            parts = path.split('/')
-            if len(parts) > 1:
-                second = parts[0]
-                third = parts[1] if len(parts) > 2 else None
-                if second not in tree:
-                    tree[second] = set()
-                if third:
-                    tree[second].add(third)
-        return tree
+        if self._dir_tree is None:
+            self._dir_tree = {second: set(thirds) for second, thirds in self._sorted_thirds.items()}
+        return self._dir_tree
 
     def get_menu_options(self):
         """
@@ -39,16 +112,15 @@ class DirFilterMenu:
             ...
         ]
         """
-        tree = self.dir_tree
+        tree = self._sorted_thirds
         if not tree:
             return [{'label': '全部', 'value': '全部'}]
         options = [{'label': '全部', 'value': '全部'}]
+        _s = self._shorten
         for second, thirds in tree.items():
-            label = second  # 不再省略
+            label = _s(second)
             if thirds:
-                children = [
-                    {'label': t, 'value': f'{second}/{t}'} for t in sorted(thirds)
-                ]
+                children = [{'label': t, 'value': f'{second}/{t}'} for t in thirds]
                 options.append({'label': label, 'value': second, 'children': children})
             else:
                 options.append({'label': label, 'value': second})
@@ -64,7 +136,7 @@ class DirFilterMenu:
         ]
         """
         mapping = {}
-        tree = self.dir_tree
+        tree = self._sorted_thirds
         if not tree:
             return mapping
 
@@ -72,26 +144,17 @@ class DirFilterMenu:
             # 不再有缩短，label就是完整名
             # mapping[second] = second  # 可选，实际用不到
             if thirds:
-                for third in sorted(thirds):
+                for third in thirds:
                     # mapping[f"{second}→{third}"] = f"{second}→{third}"  # 可选，实际用不到
                     pass
         return mapping
 
-    def _shorten(self, name):
-        # 直接返回原名，不做省略
-        return name
-
     def filter_files(self, select_value):
         """
         根据下拉选项过滤文件
         select_value: '全部' | '二级目录' | '二级/三级'
+        返回新列表，调用方修改不会影响内部分桶
         """
         if select_value == '全部':
             return self.files
-        elif '/' in select_value:
-            # 二级/三级
-            second, third = select_value.split('/', 1)
-            return [f for f in self.files if f.get('path', '').startswith(f'{second}/{third}/') or f.get('path', '') == f'{second}/{third}']
-        else:
-            # 二级目录
-            return [f for f in self.files if f.get('path', '').startswith(f'{select_value}/')] 
\ No newline at end of file
+        return list(self._by_second_third.get(select_value) or self._by_second.get(select_value, ()))
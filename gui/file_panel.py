@@ -10,12 +10,131 @@
 """
 
 import tkinter as tk
+import json
 import os
+import shutil
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox
 from tkinterdnd2 import DND_FILES
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
+from gui.link_viewer import LinkViewer
+from models.json_data import JsonData
+from utils import json_splitter
+from utils.file_list_cache import load_file_list, save_file_list
+from utils.json_handler import dumps_json
+
+
+def _write_chunk(save_path, chunk):
+    """
+    写出一个拆分后的JSON文件
+    
+    整体序列化为字节串后一次写入二进制文件，已安装orjson时由其完成序列化
+    
+    Args:
+        save_path: 保存路径
+        chunk: 拆分出的JSON数据
+    """
+    raw = dumps_json(chunk)
+    with open(save_path, 'wb') as f:
+        f.write(raw)
+
+
+def _write_chunks(tasks):
+    """
+    并发写出多个拆分文件，写盘期间线程释放GIL，可与其他文件的写入重叠
+    
+    Args:
+        tasks: [(保存路径, JSON数据), ...]
+    """
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+        # list()取出全部结果，任一写入失败时把异常抛给调用方
+        list(executor.map(lambda task: _write_chunk(*task), tasks))
+
+
+def _int_sizes(data):
+    """
+    把文件列表中的size统一转为整数，与加载到内存中的数据（经is_valid_123_json处理）保持一致
+    
+    Args:
+        data: 从磁盘读取的JSON数据，原地修改
+    """
+    files = data.get('files') if isinstance(data, dict) else None
+    if not isinstance(files, list):
+        return
+    for file in files:
+        if isinstance(file, dict) and 'size' in file:
+            try:
+                file['size'] = int(file['size'])
+            except (ValueError, TypeError):
+                file['size'] = 0
+
+
+def _existing_paths(paths):
+    """
+    批量检查文件是否存在
+    
+    按所在目录分组，每个目录只做一次os.scandir，
+    代替逐个文件调用os.path.exists，系统调用次数从文件数降为目录数
+    
+    Args:
+        paths: 文件路径列表
+        
+    Returns:
+        set: 其中存在的文件路径
+    """
+    by_dir = defaultdict(list)
+    for path in paths:
+        by_dir[os.path.dirname(path)].append(path)
+    
+    existing = set()
+    for directory, dir_paths in by_dir.items():
+        try:
+            with os.scandir(directory or '.') as entries:
+                # Windows下文件名不区分大小写，统一用normcase比较
+                present = {os.path.normcase(entry.name) for entry in entries}
+        except OSError:
+            continue
+        for path in dir_paths:
+            if os.path.normcase(os.path.basename(path)) in present:
+                existing.add(path)
+    return existing
+
+
+def _stat_key(filepath):
+    """返回(路径, 修改时间, 大小)作为缓存键，文件无法访问时返回None"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return filepath, stat.st_mtime_ns, stat.st_size
+
+
+def _load_compare_records(filepath):
+    """
+    加载文件并按(etag, 大小, 路径)建立文件记录映射，供文件对比使用
+    
+    Args:
+        filepath: JSON文件路径
+        
+    Returns:
+        tuple: (记录映射, 缓存键, 错误消息)，加载失败时记录映射为None
+    """
+    data = JsonData()
+    success, error = data.load(filepath)
+    if not success:
+        return None, None, error
+    files = data.files if data.files else []
+    records = {(f['etag'], f['size'], f['path'].replace('\\', '/')): f for f in files}
+    # 加载时可能补全字段并写回文件，缓存键取加载之后的状态
+    return records, _stat_key(filepath), ""
+
 
 class FilePanel:
     """文件列表面板类"""
@@ -33,7 +152,12 @@ class FilePanel:
         
         # 数据存储
         self.files_list = []  # 存储文件名列表
+        self._index_of = {}  # 文件名到files_list索引的映射
         self.file_paths = {}  # 存储文件名到完整路径的映射
+        self._stat_cache = {}  # 文件是否存在的短期缓存：路径 -> (是否存在, 过期时间)
+        self._compare_cache = OrderedDict()  # 文件对比记录的LRU缓存：(路径, 修改时间, 大小) -> 记录映射
+        self._select_after_id = None  # 等待执行的选中加载任务
+        self._persist_after_id = None  # 等待执行的文件列表保存任务
         
         # 重命名相关
         self.rename_entry = None  # 用于重命名的Entry控件
@@ -42,6 +166,72 @@ class FilePanel:
         
         # 创建面板
         self.create_panel()
+        
+        # 恢复上次的文件列表，不存在的文件由启动后的检查统一移除
+        self._restore_file_list()
+    
+    # 文件存在性缓存的有效期（秒）
+    STAT_CACHE_TTL = 2.0
+    
+    # 文件对比记录最多缓存的文件数
+    COMPARE_CACHE_SIZE = 8
+    
+    # 选中文件后延迟加载的时间（毫秒），连续切换选中时只加载最后一个
+    SELECT_DEBOUNCE_MS = 150
+    
+    # 文件列表变化后延迟保存的时间（毫秒），连续修改只保存一次
+    PERSIST_DELAY_MS = 500
+    
+    def _restore_file_list(self):
+        """从缓存恢复上次的文件列表"""
+        for entry in load_file_list():
+            try:
+                filename, filepath = entry
+            except (TypeError, ValueError):
+                continue
+            if filename in self._index_of:
+                continue
+            self._index_of[filename] = len(self.files_list)
+            self.files_list.append(filename)
+            self.file_paths[filename] = filepath
+        if self.files_list:
+            self.update_display()
+    
+    def _schedule_persist(self):
+        """文件列表变化后安排延迟保存"""
+        if self._persist_after_id is not None:
+            self.file_listbox.after_cancel(self._persist_after_id)
+        self._persist_after_id = self.file_listbox.after(self.PERSIST_DELAY_MS, self.persist_file_list)
+    
+    def persist_file_list(self):
+        """立即保存文件列表，供下次启动时恢复"""
+        if self._persist_after_id is not None:
+            self.file_listbox.after_cancel(self._persist_after_id)
+            self._persist_after_id = None
+        save_file_list([(filename, self.file_paths[filename]) for filename in self.files_list])
+    
+    def _exists(self, path):
+        """
+        检查文件是否存在，短时间内重复检查同一路径时直接使用缓存结果
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            bool: 文件是否存在
+        """
+        now = time.monotonic()
+        cached = self._stat_cache.get(path)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        exists = os.path.exists(path)
+        self._stat_cache[path] = (exists, now + self.STAT_CACHE_TTL)
+        return exists
+    
+    def _invalidate_stat(self, *paths):
+        """文件被重命名或删除后清除对应的存在性缓存"""
+        for path in paths:
+            self._stat_cache.pop(path, None)
     
     def create_panel(self):
         """创建文件面板"""
@@ -49,7 +239,10 @@ class FilePanel:
         self.frame = ttk.LabelFrame(self.parent, text="JSON文件", padding="10")
         
         # 创建支持拖放的Listbox，设置为多选模式
-        self.file_listbox = tk.Listbox(self.frame, selectmode=tk.EXTENDED, height=25, width=30)  # 增加高度和宽度
+        # 列表内容绑定到变量，整体刷新时只需一次set
+        self._listvar = tk.Variable(value=())
+        self.file_listbox = tk.Listbox(self.frame, selectmode=tk.EXTENDED, height=25, width=30,  # 增加高度和宽度
+                                       listvariable=self._listvar)
         self.file_listbox.pack(fill=BOTH, expand=True, padx=5, pady=5)
         self.file_listbox.bind('<<ListboxSelect>>', self.on_file_select)
         self.file_listbox.bind('<Double-Button-1>', self.start_rename)
@@ -116,7 +309,8 @@ class FilePanel:
     def on_drop(self, event):
         """处理文件拖放事件"""
         files = self.app.root.tk.splitlist(event.data)
-        json_files = [f for f in files if f.lower().endswith('.json')]
+        # 只取末尾5个字符转小写比较，不必复制整条路径
+        json_files = [f for f in files if f[-5:].lower() == '.json']
         if json_files:
             self.add_json_files(json_files)
         elif files:
@@ -129,19 +323,27 @@ class FilePanel:
         Args:
             files: JSON文件路径列表
         """
+        was_empty = not self.files_list
+        added = []
         for filepath in files:
             # 获取文件名
             filename = os.path.basename(filepath)
-            # 检查文件是否已在列表中
-            if filename not in self.files_list:
-                self.files_list.append(filename)
-                self.file_paths[filename] = filepath  # 保存文件路径映射
-                # 如果是第一个文件，自动加载它
-                if len(self.files_list) == 1:
-                    self.app.load_json_file(filepath)
-        
-        # 更新显示
-        self.update_display()
+            # 检查文件是否已在列表中（同一批中的重名文件也只添加一次）
+            if filename in self._index_of:
+                continue
+            self._index_of[filename] = len(self.files_list)
+            self.files_list.append(filename)
+            self.file_paths[filename] = filepath  # 保存文件路径映射
+            added.append(filename)
+        
+        if not added:
+            return
+        # 新行一次性追加到列表末尾，不重建整个列表
+        self.file_listbox.insert(tk.END, *added)
+        self._schedule_persist()
+        # 如果添加前列表为空，自动加载第一个文件
+        if was_empty:
+            self.app.load_json_file(self.file_paths[added[0]])
     
     def add_file_to_list(self, filename, filepath):
         """
@@ -151,22 +353,44 @@ class FilePanel:
             filename: 文件名
             filepath: 文件路径
         """
-        if filename not in self.files_list:
+        # 文件可能刚被写出，旧的存在性缓存作废
+        self._invalidate_stat(filepath)
+        if filename not in self._index_of:
+            self._index_of[filename] = len(self.files_list)
             self.files_list.append(filename)
             self.file_paths[filename] = filepath
-            self.update_display()
+            self._append_to_listbox(filename)
+            self._schedule_persist()
     
     def on_file_select(self, event):
-        """当选择JSON文件时触发"""
+        """
+        当选择JSON文件时触发
+        
+        用方向键快速移动选中项时每一步都会触发，延迟加载并取消上一次未执行的加载，
+        只读取停留的那个文件
+        """
         selection = self.file_listbox.curselection()
         if not selection:
             return
             
-        filename = self.file_listbox.get(selection[0])
-        if filename in self.file_paths:
-            filepath = self.file_paths[filename]
-            # 检查文件是否存在
-            if not os.path.exists(filepath):
+        filename = self.files_list[selection[0]]
+        if self._select_after_id is not None:
+            self.file_listbox.after_cancel(self._select_after_id)
+        self._select_after_id = self.file_listbox.after(self.SELECT_DEBOUNCE_MS, self._load_selected, filename)
+    
+    def _load_selected(self, filename):
+        """
+        加载选中的文件
+        
+        Args:
+            filename: 选中的文件名
+        """
+        self._select_after_id = None
+        filepath = self.file_paths.get(filename)
+        if filepath is not None:
+            # 等待后台保存写完，再检查文件是否存在
+            self.app.flush_saves()
+            if not self._exists(filepath):
                 messagebox.showwarning("警告", f"文件不存在: {filepath}\n将从列表中移除")
                 self.remove_file_from_list(filename)
                 return
@@ -174,13 +398,66 @@ class FilePanel:
             self.app.load_json_file(filepath)
     
     def update_display(self):
-        """更新文件列表显示"""
-        # 清空当前列表
-        self.file_listbox.delete(0, tk.END)
+        """
+        更新文件列表显示
         
-        # 显示所有文件
-        for filename in self.files_list:
-            self.file_listbox.insert(tk.END, filename)
+        Listbox只绘制可见区域的行，开销主要在逐行insert的Tcl调用上，
+        因此通过绑定的listvariable整体替换内容，与列表长度无关地只需一次调用
+        """
+        self._listvar.set(tuple(self.files_list))
+    
+    def _append_to_listbox(self, filename):
+        """在列表末尾追加一行"""
+        self.file_listbox.insert(tk.END, filename)
+    
+    def _remove_from_listbox(self, index):
+        """按索引删除一行，Listbox与files_list的索引一一对应"""
+        self.file_listbox.delete(index)
+    
+    def _write_chunks_async(self, tasks, on_done):
+        """
+        在写入线程写出拆分文件，写完后回到主线程回调，写盘期间界面不卡顿，
+        关闭窗口时会等待写完，不会留下写了一半的文件
+        
+        Args:
+            tasks: [(保存路径, JSON数据), ...]
+            on_done: 写出结束后在主线程调用，参数为写入时的异常，成功时为None
+        """
+        self.app.submit_write(_write_chunks, (tasks,), on_done)
+    
+    def _reindex(self):
+        """files_list顺序变化后重建文件名到索引的映射"""
+        self._index_of = {filename: i for i, filename in enumerate(self.files_list)}
+    
+    def _remove_indices(self, indices):
+        """
+        按索引批量移除文件（不删除实际文件）
+        
+        从后往前删除，前面行的索引不受影响，全部删除后只重建一次索引映射；
+        连续的行合并为一次delete(first, last)，减少Tcl调用次数
+        
+        Args:
+            indices: 要移除的索引
+        """
+        removed = set(indices)
+        run_first = run_last = None
+        for idx in sorted(removed, reverse=True):
+            filename = self.files_list[idx]
+            filepath = self.file_paths.pop(filename, None)
+            if filepath:
+                self._invalidate_stat(filepath)
+            if run_first is not None and idx == run_first - 1:
+                run_first = idx
+                continue
+            if run_first is not None:
+                self.file_listbox.delete(run_first, run_last)
+            run_first = run_last = idx
+        if run_first is not None:
+            self.file_listbox.delete(run_first, run_last)
+        # 一次过滤代替逐个pop，避免每次pop都移动后面的元素
+        self.files_list[:] = [f for i, f in enumerate(self.files_list) if i not in removed]
+        self._reindex()
+        self._schedule_persist()
     
     def sort_files(self, reverse=False):
         """
@@ -190,7 +467,9 @@ class FilePanel:
             reverse: 是否逆序排序
         """
         self.files_list.sort(reverse=reverse)
+        self._reindex()
         self.update_display()
+        self._schedule_persist()
     
     def show_file_menu(self, event):
         """显示文件列表的右键菜单"""
@@ -211,18 +490,7 @@ class FilePanel:
             messagebox.showwarning("警告", "请选择要删除的文件")
             return
         
-        # 获取选中的文件名
-        selected_files = [self.file_listbox.get(idx) for idx in selected]
-        
-        # 从文件列表中删除选中的文件
-        for filename in selected_files:
-            if filename in self.files_list:
-                self.files_list.remove(filename)
-            if filename in self.file_paths:
-                del self.file_paths[filename]
-        
-        # 更新显示
-        self.update_display()
+        self._remove_indices(selected)
         
         # 如果当前没有文件，清空树形视图
         if not self.files_list:
@@ -238,7 +506,8 @@ class FilePanel:
             return
         
         # 获取选中的文件名
-        selected_files = [self.file_listbox.get(idx) for idx in selected]
+        # files_list与Listbox逐行对应，直接按索引取文件名，不再逐个调用Listbox.get
+        selected_files = [self.files_list[idx] for idx in selected]
         
         # 确认删除
         if len(selected_files) == 1:
@@ -249,25 +518,27 @@ class FilePanel:
         if not confirm:
             return
         
+        # 等待后台保存写完再删除
+        self.app.flush_saves()
         deleted_count = 0
-        for filename in selected_files:
-            if filename in self.file_paths:
-                filepath = self.file_paths[filename]
+        removed = []
+        for idx in selected:
+            filename = self.files_list[idx]
+            filepath = self.file_paths.get(filename)
+            if filepath is not None:
                 try:
-                    # 删除文件
-                    if os.path.exists(filepath):
+                    # 删除文件，直接删除并忽略已不存在的文件，省去一次存在性检查
+                    try:
                         os.remove(filepath)
                         deleted_count += 1
-                    
-                    # 从列表中移除
-                    if filename in self.files_list:
-                        self.files_list.remove(filename)
-                        del self.file_paths[filename]
+                    except FileNotFoundError:
+                        pass
+                    removed.append(idx)
                 except Exception as e:
                     messagebox.showerror("错误", f"删除文件 {filename} 时出错: {str(e)}")
         
-        # 更新显示
-        self.update_display()
+        # 从列表中统一移除
+        self._remove_indices(removed)
         
         # 如果当前没有文件，清空树形视图
         if not self.files_list:
@@ -284,12 +555,12 @@ class FilePanel:
             return
         
         index = selected[0]
-        filename = self.file_listbox.get(index)
+        filename = self.files_list[index]
         
         # 检查文件是否存在
-        if filename in self.file_paths:
-            filepath = self.file_paths[filename]
-            if not os.path.exists(filepath):
+        filepath = self.file_paths.get(filename)
+        if filepath is not None:
+            if not self._exists(filepath):
                 messagebox.showwarning("警告", f"文件不存在: {filepath}\n将从列表中移除")
                 self.remove_file_from_list(filename)
                 return
@@ -322,7 +593,7 @@ class FilePanel:
             return
         
         try:
-            old_filename = self.file_listbox.get(self.rename_index)
+            old_filename = self.files_list[self.rename_index]
             new_filename = self.rename_entry.get().strip()
             
             # 检查新文件名是否为空
@@ -331,23 +602,27 @@ class FilePanel:
                 self.cancel_rename()
                 return
             
+            # 文件名未改动时直接结束，不做任何文件操作
+            if new_filename == old_filename:
+                self.cancel_rename()
+                return
+            
             # 检查新文件名是否已存在
-            if new_filename != old_filename and new_filename in self.files_list:
+            if new_filename in self._index_of:
                 messagebox.showwarning("警告", f"文件名 {new_filename} 已存在")
                 self.cancel_rename()
                 return
             
             # 检查旧文件是否存在映射
-            if old_filename not in self.file_paths:
+            # 获取旧文件路径
+            old_filepath = self.file_paths.get(old_filename)
+            if old_filepath is None:
                 messagebox.showerror("错误", f"无法找到文件 {old_filename} 的路径映射")
                 self.cancel_rename()
                 return
-                
-            # 获取旧文件路径
-            old_filepath = self.file_paths[old_filename]
             
             # 检查文件是否存在
-            if not os.path.exists(old_filepath):
+            if not self._exists(old_filepath):
                 messagebox.showwarning("警告", f"文件不存在: {old_filepath}\n将从列表中移除")
                 self.remove_file_from_list(old_filename)
                 self.cancel_rename()
@@ -356,9 +631,11 @@ class FilePanel:
             # 构建新文件路径
             new_filepath = os.path.join(os.path.dirname(old_filepath), new_filename)
             
-            # 原子性操作：先尝试重命名文件
+            # 原子性操作：先尝试重命名文件（先等待后台保存写完）
+            self.app.flush_saves()
             try:
                 os.rename(old_filepath, new_filepath)
+                self._invalidate_stat(old_filepath, new_filepath)
             except Exception as e:
                 messagebox.showerror("错误", f"重命名文件时出错: {str(e)}")
                 self.cancel_rename()
@@ -366,11 +643,14 @@ class FilePanel:
             
             # 更新文件列表和映射
             self.files_list[self.rename_index] = new_filename
+            self._index_of[new_filename] = self._index_of.pop(old_filename)
+            self.file_paths.pop(old_filename, None)
             self.file_paths[new_filename] = new_filepath
-            del self.file_paths[old_filename]
             
-            # 更新显示
-            self.update_display()
+            # 只替换被重命名的那一行
+            self._remove_from_listbox(self.rename_index)
+            self.file_listbox.insert(self.rename_index, new_filename)
+            self._schedule_persist()
             
             # 如果当前加载的是这个文件，更新当前文件路径
             if self.app.current_file == old_filepath:
@@ -394,24 +674,48 @@ class FilePanel:
         Args:
             filename: 要移除的文件名
         """
-        if filename in self.files_list:
-            self.files_list.remove(filename)
-        if filename in self.file_paths:
-            del self.file_paths[filename]
-        self.update_display()
+        index = self._index_of.get(filename)
+        if index is not None:
+            self._remove_indices([index])
+        else:
+            filepath = self.file_paths.pop(filename, None)
+            if filepath:
+                self._invalidate_stat(filepath)
     
     def check_all_files_exist(self):
-        """检查所有文件是否存在，移除不存在的文件"""
-        files_to_remove = []
+        """
+        检查所有文件是否存在，移除不存在的文件
         
-        for filename in self.files_list:
-            filepath = self.file_paths.get(filename)
-            if filepath and not os.path.exists(filepath):
-                files_to_remove.append(filename)
+        文件可能位于网络盘等较慢的位置，检查放在后台线程中进行，
+        结果通过root.after交回主线程处理，避免界面卡顿
+        """
+        paths = [p for p in self.file_paths.values() if p]
+        if not paths:
+            return
+        
+        def sweep():
+            existing = _existing_paths(paths)
+            missing = {p for p in paths if p not in existing}
+            if missing:
+                self.app.root.after(0, lambda: self._apply_removals(missing))
+        
+        threading.Thread(target=sweep, daemon=True).start()
+    
+    def _apply_removals(self, missing):
+        """
+        在主线程中移除后台检查发现不存在的文件
+        
+        Args:
+            missing: 不存在的文件路径集合
+        """
+        # 检查期间列表可能已变化，按当前列表重新定位
+        files_to_remove = [
+            index for index, filename in enumerate(self.files_list)
+            if self.file_paths.get(filename) in missing
+        ]
         
         if files_to_remove:
-            for filename in files_to_remove:
-                self.remove_file_from_list(filename)
+            self._remove_indices(files_to_remove)
             
             if self.files_list:
                 # 如果还有文件，加载第一个
@@ -432,13 +736,11 @@ class FilePanel:
             return
         
         # 获取选中的文件路径
-        filepaths = []
-        for idx in selected:
-            filename = self.file_listbox.get(idx)
-            if filename in self.file_paths:
-                filepath = self.file_paths[filename]
-                if os.path.exists(filepath):
-                    filepaths.append(filepath)
+        file_paths = self.file_paths
+        files_list = self.files_list
+        candidates = [p for p in (file_paths.get(files_list[idx]) for idx in selected) if p]
+        existing = _existing_paths(candidates)
+        filepaths = [p for p in candidates if p in existing]
         
         if len(filepaths) < 2:
             messagebox.showwarning("警告", "至少需要两个有效的文件才能合并")
@@ -449,15 +751,18 @@ class FilePanel:
         if not confirm:
             return
         
-        # 执行合并
-        success, message, merged_filename = self.app.merge_files(filepaths)
+        def on_merged(success, message, merged_filename):
+            if success:
+                # 添加合并后的文件到列表
+                self.add_file_to_list(os.path.basename(merged_filename), merged_filename)
+                messagebox.showinfo("成功", message)
+            else:
+                messagebox.showerror("错误", message)
         
-        if success:
-            # 添加合并后的文件到列表
-            self.add_file_to_list(os.path.basename(merged_filename), merged_filename)
-            messagebox.showinfo("成功", message)
-        else:
-            messagebox.showerror("错误", message)
+        # 执行合并，读取和合并在后台进行，完成后回调
+        started, message = self.app.merge_files(filepaths, on_merged)
+        if not started:
+            messagebox.showwarning("警告", message)
     
     def compare_files(self):
         """对比选中的两个文件"""
@@ -467,15 +772,15 @@ class FilePanel:
             return
         
         # 获取选中的文件路径
+        selected_names = [self.files_list[idx] for idx in selected]
+        existing = _existing_paths([p for p in map(self.file_paths.get, selected_names) if p])
         filepaths = []
         filenames = []
-        for idx in selected:
-            filename = self.file_listbox.get(idx)
-            if filename in self.file_paths:
-                filepath = self.file_paths[filename]
-                if os.path.exists(filepath):
-                    filepaths.append(filepath)
-                    filenames.append(filename)
+        for filename in selected_names:
+            filepath = self.file_paths.get(filename)
+            if filepath in existing:
+                filepaths.append(filepath)
+                filenames.append(filename)
         
         if len(filepaths) != 2:
             messagebox.showwarning("警告", "需要恰好两个有效的文件才能对比")
@@ -548,63 +853,64 @@ class FilePanel:
         dialog.destroy()
         
         try:
-            # 加载两个文件的数据
-            from models.json_data import JsonData
+            # 加载两个文件的数据（先等待后台保存写完）
+            self.app.flush_saves()
+            
+            # 文件未修改时直接使用上次对比建立的记录映射
+            cache = self._compare_cache
+            results = {}
+            misses = []
+            for filepath in filepaths[:2]:
+                key = _stat_key(filepath)
+                records = cache.get(key) if key is not None else None
+                if records is not None:
+                    cache.move_to_end(key)
+                    results[filepath] = (records, "")
+                elif filepath not in misses:
+                    misses.append(filepath)
             
-            data1 = JsonData()
-            success1, error1 = data1.load(filepaths[0])
-            if not success1:
+            if misses:
+                # 未命中的文件并发读取，磁盘等待互相重叠；结果全部返回后再统一报错
+                with ThreadPoolExecutor(max_workers=len(misses)) as executor:
+                    loaded = list(executor.map(_load_compare_records, misses))
+                for filepath, (records, key, error) in zip(misses, loaded):
+                    results[filepath] = (records, error)
+                    if records is not None and key is not None:
+                        cache[key] = records
+                        if len(cache) > self.COMPARE_CACHE_SIZE:
+                            cache.popitem(last=False)
+            
+            records1, error1 = results[filepaths[0]]
+            if records1 is None:
                 messagebox.showerror("错误", f"无法加载文件1: {error1}")
                 return
             
-            data2 = JsonData()
-            success2, error2 = data2.load(filepaths[1])
-            if not success2:
+            records2, error2 = results[filepaths[1]]
+            if records2 is None:
                 messagebox.showerror("错误", f"无法加载文件2: {error2}")
                 return
             
-            # 获取文件中的秒链
-            files1 = data1.files if data1.files else []
-            files2 = data2.files if data2.files else []
-            
-            # 创建秒链集合
-            links1 = set()
-            links2 = set()
-            
-            for file in files1:
-                # 生成完整秒链
-                from utils.link_parser import LinkParser
-                full_link = LinkParser.generate_link([file])
-                links1.add(full_link)
-            
-            for file in files2:
-                # 生成完整秒链
-                from utils.link_parser import LinkParser
-                full_link = LinkParser.generate_link([file])
-                links2.add(full_link)
+            # 按(etag, 大小, 路径)对文件记录做集合运算，
+            # 只为结果中的文件生成秒链，避免为两侧全部文件拼接秒链
             
             # 根据对比类型获取结果
             if compare_type == "same":
                 # 相同秒链（交集）
-                result_links = links1.intersection(links2)
+                result_files = [records1[key] for key in records1.keys() & records2.keys()]
                 title = "相同秒链"
             else:
                 # 不同秒链（对称差集）
-                result_links = links1.symmetric_difference(links2)
+                result_files = [records1.get(key) or records2[key] for key in records1.keys() ^ records2.keys()]
                 title = "不同秒链"
             
             # 显示结果
-            if result_links:
-                # 创建秒链查看器显示结果
-                from gui.link_viewer import LinkViewer
+            if result_files:
+                # 创建秒链查看器显示结果，直接传入文件信息，不再拼接成文本后重新解析
                 viewer = LinkViewer(self.app.root, self.app)
                 viewer.title(f"文件对比结果 - {title}")
+                viewer.show_files(result_files)
                 
-                # 将秒链转换为文本格式
-                link_text = "\n".join(result_links)
-                viewer.parse_and_show_links(link_text)
-                
-                messagebox.showinfo("对比完成", f"找到 {len(result_links)} 个{title}")
+                messagebox.showinfo("对比完成", f"找到 {len(result_files)} 个{title}")
             else:
                 messagebox.showinfo("对比完成", f"没有找到{title}")
                 
@@ -618,22 +924,27 @@ class FilePanel:
         if not selection:
             messagebox.showwarning("提示", "请先选择要拆分的JSON文件")
             return
-        filename = self.file_listbox.get(selection[0])
+        filename = self.files_list[selection[0]]
         filepath = self.file_paths.get(filename)
-        if not filepath or not os.path.exists(filepath):
+        if not filepath or not self._exists(filepath):
             messagebox.showerror("错误", f"文件不存在: {filepath}")
             return
-        # 读取JSON内容
-        import json
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-        except Exception as e:
-            messagebox.showerror("错误", f"读取JSON文件失败: {e}")
-            return
+        # 读取JSON内容（先等待后台保存写完），已加载且未被外部修改时直接使用内存数据
+        self.app.flush_saves()
+        json_data = self.app.get_loaded_data(filepath)
+        if json_data is None:
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    json_data = json.load(f)
+            except Exception as e:
+                messagebox.showerror("错误", f"读取JSON文件失败: {e}")
+                return
+            # 内存数据中的size已是整数，磁盘上可能是字符串，统一后拆分结果与来源无关
+            _int_sizes(json_data)
         # 分析结构
-        from utils import json_splitter
         analysis = json_splitter.analyze_json_structure(json_data)
+        # 原文件名只拆分一次，供下面各回调共用
+        base, ext = os.path.splitext(filename)
         # 居中弹窗函数
         def center_window(win, width, height):
             win.update_idletasks()
@@ -713,26 +1024,32 @@ class FilePanel:
         split_mode.trace_add('write', update_naming_state)
         update_naming_state()
 
-        def ellipsis_filename(idx, base, ext):
+        # 完整名和省略名中与序号无关的部分预先拼好
+        full_tail = base + ext
+        short_tail = f"{base[:6]}...{base[-8:] if len(base) > 8 else base}{ext}"
+
+        def ellipsis_filename(idx):
             idx_str = f"{idx+1:02d}_"
             maxlen = 30
-            name = idx_str + base + ext
+            name = idx_str + full_tail
             if len(name) <= maxlen:
                 return name
             else:
-                prefix = base[:6]
-                suffix = base[-8:] if len(base) > 8 else base
-                return f"{idx_str}{prefix}...{suffix}{ext}"
+                return idx_str + short_tail
 
-        def on_push_all():
-            exts = []
-            if ext_vars['nfo'].get(): exts.append('nfo')
-            if ext_vars['jpg'].get(): exts.extend(['jpg','jpeg'])
-            if ext_vars['png'].get(): exts.append('png')
+        def collect_exts():
+            """根据勾选项和自定义输入收集需要过滤的扩展名"""
+            exts = set()
+            if ext_vars['nfo'].get(): exts.add('nfo')
+            if ext_vars['jpg'].get(): exts.update(('jpg', 'jpeg'))
+            if ext_vars['png'].get(): exts.add('png')
             custom = custom_ext_var.get().strip()
             if custom:
-                exts += [e.strip().lower() for e in custom.split(',') if e.strip()]
-            filtered_json = json_splitter.filter_json_files(json_data, exts)
+                exts.update(e.strip().lower() for e in custom.split(',') if e.strip())
+            return frozenset(exts)
+
+        def on_push_all():
+            filtered_json = json_splitter.filter_json_files(json_data, collect_exts())
             try:
                 if split_mode.get() == 'folder':
                     level = level_var.get()
@@ -746,30 +1063,30 @@ class FilePanel:
             if not chunks:
                 messagebox.showwarning("提示", "拆分结果为空！")
                 return
-            import os
-            import json as _json
-            base, ext = os.path.splitext(filename)
             orig_dir = os.path.dirname(filepath)
-            pushed = 0
-            for i, chunk in enumerate(chunks):
-                full_name = f"{i+1:02d}_{base}{ext}"
-                save_path = os.path.join(orig_dir, full_name)
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    _json.dump(chunk, f, ensure_ascii=False, indent=2)
-                self.add_file_to_list(full_name, save_path)
-                pushed += 1
-            messagebox.showinfo("完成", f"已推送 {pushed} 个文件到列表\n文件已保存在: {orig_dir}")
-            win.destroy()
+            # 目录前缀和文件名后缀只拼接一次，循环内只做字符串连接
+            dir_prefix = os.path.join(orig_dir, '')
+            name_suffix = f"_{base}{ext}"
+            targets = []
+            for i in range(len(chunks)):
+                full_name = f"{i+1:02d}{name_suffix}"
+                targets.append((full_name, dir_prefix + full_name))
+            def on_pushed(error):
+                if error is not None:
+                    messagebox.showerror("错误", f"写出拆分文件时出错: {error}")
+                    return
+                for full_name, save_path in targets:
+                    self.add_file_to_list(full_name, save_path)
+                pushed = len(targets)
+                messagebox.showinfo("完成", f"已推送 {pushed} 个文件到列表\n文件已保存在: {orig_dir}")
+                # 写盘期间窗口可能已被手动关闭
+                if win.winfo_exists():
+                    win.destroy()
+            # 先在后台并发写出全部文件，写完后再统一加入列表
+            self._write_chunks_async([(save_path, chunk) for (_, save_path), chunk in zip(targets, chunks)], on_pushed)
 
         def on_confirm():
-            exts = []
-            if ext_vars['nfo'].get(): exts.append('nfo')
-            if ext_vars['jpg'].get(): exts.extend(['jpg','jpeg'])
-            if ext_vars['png'].get(): exts.append('png')
-            custom = custom_ext_var.get().strip()
-            if custom:
-                exts += [e.strip().lower() for e in custom.split(',') if e.strip()]
-            filtered_json = json_splitter.filter_json_files(json_data, exts)
+            filtered_json = json_splitter.filter_json_files(json_data, collect_exts())
             try:
                 if split_mode.get() == 'folder':
                     level = level_var.get()
@@ -792,7 +1109,6 @@ class FilePanel:
         ttk.Button(frm_btn, text="开始拆分", bootstyle="success", command=on_confirm, width=12).pack(side='left', padx=18)
 
         def show_split_result(chunks):
-            import os
             res_win = tk.Toplevel(self.parent)
             res_win.title("拆分结果 - 请选择要保存/推送的文件")
             center_window(res_win, 480, 420)
@@ -801,9 +1117,9 @@ class FilePanel:
             ttk.Label(res_win, text=f"共拆分为 {len(chunks)} 个文件：", font=(None, 11, 'bold')).pack(anchor='w', padx=10, pady=(10,2))
             listbox = tk.Listbox(res_win, selectmode=tk.EXTENDED, height=12)
             listbox.pack(fill=tk.BOTH, expand=True, padx=12, pady=6)
-            base, ext = os.path.splitext(filename)
             # 生成完整名和省略名列表
-            if split_mode.get() == 'folder' and naming_mode.get() == 'folder':
+            use_seq_name = naming_mode.get() == 'seq' or split_mode.get() != 'folder'
+            if not use_seq_name:
                 # 按目录名命名，重名自动加序号
                 name_count = {}
                 full_filenames = []
@@ -818,10 +1134,13 @@ class FilePanel:
                         file_name = f"{folder_name}{ext}"
                     full_filenames.append(file_name)
             else:
-                full_filenames = [f"{idx+1:02d}_{base}{ext}" for idx in range(len(chunks))]
+                name_suffix = f"_{base}{ext}"
+                full_filenames = [f"{idx+1:02d}{name_suffix}" for idx in range(len(chunks))]
+            rows = []
             for idx, chunk in enumerate(chunks):
-                name = ellipsis_filename(idx, base, ext) if naming_mode.get() == 'seq' or split_mode.get() != 'folder' else full_filenames[idx]
-                listbox.insert(tk.END, f"{name}  (文件数:{chunk.get('totalFilesCount', len(chunk.get('files',[])))})")
+                name = ellipsis_filename(idx) if use_seq_name else full_filenames[idx]
+                rows.append(f"{name}  (文件数:{chunk.get('totalFilesCount', len(chunk.get('files',[])))})")
+            listbox.insert(tk.END, *rows)
             btn_frame = ttk.Frame(res_win)
             btn_frame.pack(pady=8)
             def save_selected():
@@ -829,9 +1148,6 @@ class FilePanel:
                 if not sel:
                     messagebox.showwarning("提示", "请先选择要保存的文件")
                     return
-                import json as _json
-                from tkinter import filedialog
-                import os
                 if len(sel) == 1:
                     # 单选时仍用文件对话框
                     i = sel[0]
@@ -843,41 +1159,42 @@ class FilePanel:
                         filetypes=[("JSON文件", "*.json")]
                     )
                     if save_path:
-                        with open(save_path, 'w', encoding='utf-8') as f:
-                            _json.dump(chunk, f, ensure_ascii=False, indent=2)
+                        _write_chunk(save_path, chunk)
                         messagebox.showinfo("完成", f"已保存文件: {os.path.basename(save_path)}")
                 else:
                     # 多选时批量保存到文件夹
                     target_dir = filedialog.askdirectory(title="选择保存文件夹")
                     if not target_dir:
                         return
-                    count = 0
-                    for i in sel:
-                        chunk = chunks[i]
-                        save_path = os.path.join(target_dir, full_filenames[i])
-                        with open(save_path, 'w', encoding='utf-8') as f:
-                            _json.dump(chunk, f, ensure_ascii=False, indent=2)
-                        count += 1
-                    messagebox.showinfo("完成", f"已保存 {count} 个文件到 {target_dir}")
+                    dir_prefix = os.path.join(target_dir, '')
+                    count = len(sel)
+                    def on_saved(error):
+                        if error is not None:
+                            messagebox.showerror("错误", f"保存拆分文件时出错: {error}")
+                            return
+                        messagebox.showinfo("完成", f"已保存 {count} 个文件到 {target_dir}")
+                    self._write_chunks_async([(dir_prefix + full_filenames[i], chunks[i]) for i in sel], on_saved)
             def push_selected():
                 sel = listbox.curselection()
                 if not sel:
                     messagebox.showwarning("提示", "请先选择要推送的文件")
                     return
-                import os
-                import json as _json
                 orig_dir = os.path.dirname(filepath)
-                pushed = 0
-                for i in sel:
-                    chunk = chunks[i]
-                    full_name = full_filenames[i]
-                    save_path = os.path.join(orig_dir, full_name)
-                    with open(save_path, 'w', encoding='utf-8') as f:
-                        _json.dump(chunk, f, ensure_ascii=False, indent=2)
-                    self.add_file_to_list(full_name, save_path)
-                    if os.path.exists(save_path):
-                        pushed += 1
-                messagebox.showinfo("完成", f"已推送 {pushed} 个文件到列表\n文件已保存在: {orig_dir}\n可继续操作或手动关闭窗口")
+                dir_prefix = os.path.join(orig_dir, '')
+                targets = [(full_filenames[i], dir_prefix + full_filenames[i]) for i in sel]
+                def on_pushed(error):
+                    if error is not None:
+                        messagebox.showerror("错误", f"写出拆分文件时出错: {error}")
+                        return
+                    pushed = 0
+                    existing = _existing_paths([save_path for _, save_path in targets])
+                    for full_name, save_path in targets:
+                        self.add_file_to_list(full_name, save_path)
+                        if save_path in existing:
+                            pushed += 1
+                    messagebox.showinfo("完成", f"已推送 {pushed} 个文件到列表\n文件已保存在: {orig_dir}\n可继续操作或手动关闭窗口")
+                # 先在后台并发写出全部文件，写完后再统一加入列表
+                self._write_chunks_async([(save_path, chunks[i]) for (_, save_path), i in zip(targets, sel)], on_pushed)
             ttk.Button(btn_frame, text="保存到本地", bootstyle="primary", command=save_selected, width=12).pack(side='left', padx=18)
             ttk.Button(btn_frame, text="推送列表", bootstyle="success", command=push_selected, width=12).pack(side='left', padx=18)
 
@@ -887,13 +1204,11 @@ class FilePanel:
         if not selection:
             messagebox.showwarning("提示", "请先选择要另存为的JSON文件")
             return
-        filename = self.file_listbox.get(selection[0])
+        filename = self.files_list[selection[0]]
         filepath = self.file_paths.get(filename)
-        if not filepath or not os.path.exists(filepath):
+        if not filepath or not self._exists(filepath):
             messagebox.showerror("错误", f"文件不存在: {filepath}")
             return
-        from tkinter import filedialog
-        import shutil
         save_path = filedialog.asksaveasfilename(
             title="另存为",
             defaultextension=".json",
@@ -902,6 +1217,7 @@ class FilePanel:
         )
         if save_path:
             try:
+                self.app.flush_saves()
                 shutil.copyfile(filepath, save_path)
                 messagebox.showinfo("完成", f"已另存为: {save_path}")
             except Exception as e:
@@ -8,16 +8,24 @@
 - 链接验证
 """
 
+import threading
 import tkinter as tk
 from tkinter import messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from gui.link_viewer import LinkViewer
+from utils.link_parser import LinkParser
 
 
 class LinkPanel:
     """链接输入和导出面板类"""
     
+    # 超过该长度的单个链接可能包含数万个文件，也放到后台解析，避免界面卡住
+    DIRECT_ADD_MAX_CHARS = 100_000
+    
+    # 查看器只缓存不超过该长度的秒链的解析结果
+    PARSE_CACHE_MAX_CHARS = 1_000_000
+    
     def __init__(self, parent, app):
         """
         初始化链接面板
@@ -29,6 +37,7 @@ class LinkPanel:
         self.parent = parent
         self.app = app
         self.link_viewer = None
+        self._parse_cache = None  # 查看器最近一次解析的(秒链文本, 解析结果)
         
         # 创建面板
         self.create_panel()
@@ -107,8 +116,21 @@ class LinkPanel:
         # 创建新的链接查看器弹窗
         self.link_viewer = LinkViewer(self.app.root, self.app)
         
-        # 解析并显示链接
-        self.link_viewer.parse_and_show_links(link_text)
+        # 解析并显示链接，同一段秒链再次查看时复用上次的解析结果
+        self.link_viewer.parse_and_show_links(link_text, self._parse_for_viewer)
+    
+    def _parse_for_viewer(self, link_text):
+        """
+        解析查看器中的秒链，只缓存最近一次且长度不超过上限的结果
+        
+        结果与查看器共享，查看器只读取不修改
+        """
+        cached = self._parse_cache
+        if cached is not None and cached[0] == link_text:
+            return cached[1]
+        result = LinkParser.parse_link(link_text)
+        self._parse_cache = (link_text, result) if len(link_text) <= self.PARSE_CACHE_MAX_CHARS else None
+        return result
     
     def add_link(self, event=None):
         """
@@ -128,14 +150,14 @@ class LinkPanel:
             messagebox.showwarning("警告", "请输入链接")
             return
         
-        # 检查是否有多行内容
-        if '\n' in link_text or len(link_text) > 500:
-            # 多行内容，使用批量处理
+        # 多行、多个链接首尾相连或单个链接特别长时使用后台批量处理，普通的单个链接直接添加
+        if ('\n' in link_text or len(link_text) > self.DIRECT_ADD_MAX_CHARS
+                or link_text.count('123F') > 1):
+            # 使用批量处理
             self._process_links_in_background(link_text)
             return
         
         # 单行内容，正常处理
-        from utils.link_parser import LinkParser
         valid, error_msg = LinkParser.validate_link_format(link_text)
         if not valid:
             messagebox.showerror("错误", error_msg)
@@ -187,10 +209,6 @@ class LinkPanel:
     
     def _process_links_in_background(self, content):
         """在后台线程中处理链接"""
-        import threading
-        import queue
-        from queue import Queue
-        
         # 创建进度条窗口
         progress_window = tk.Toplevel(self.app.root)
         progress_window.title("处理中")
@@ -221,20 +239,21 @@ class LinkPanel:
         )
         progress_bar.pack(pady=20)
         
-        # 添加取消按钮
-        cancel_var = tk.BooleanVar(value=False)
+        # 添加取消按钮（取消标志由后台线程读取，不能用Tk变量）
+        cancel_event = threading.Event()
         cancel_button = ttk.Button(
             progress_window, 
             text="取消", 
-            command=lambda: [cancel_var.set(True), progress_window.destroy()],
+            command=lambda: [cancel_event.set(), progress_window.destroy()],
             bootstyle="danger"
         )
         cancel_button.pack(pady=10)
         
-        # 创建结果队列
-        result_queue = Queue()
+        # 后台线程把结果交给主线程处理，不再轮询结果队列
+        def post_result(status, data):
+            self.app.root.after(0, show_result, status, data)
         
-        # 在后台线程中处理链接
+        # 在后台线程中只解析链接，界面和数据的修改都交回主线程
         def process_link():
             try:
                 # 检查是否包含多个链接
@@ -242,7 +261,7 @@ class LinkPanel:
                 total_links = len(links)
                 
                 if total_links == 0:
-                    result_queue.put(("error", "未找到有效链接"))
+                    post_result("error", "未找到有效链接")
                     return
                 
                 # 更新状态
@@ -252,25 +271,26 @@ class LinkPanel:
                 batch_size = 100
                 success_count = 0
                 error_messages = []
-                total_files_added = 0
+                all_files = []
                 
                 for i in range(0, total_links, batch_size):
-                    if cancel_var.get():
-                        result_queue.put("cancelled", "处理已取消")
+                    if cancel_event.is_set():
+                        post_result("cancelled", "处理已取消")
                         return
                         
                     batch = links[i:i+batch_size]
-                    batch_success, _, batch_errors, batch_files = self.app.batch_add_links(batch)
+                    batch_success, batch_errors, batch_files = self.app.parse_links(batch, i)
                     
                     success_count += batch_success
                     error_messages.extend(batch_errors)
-                    total_files_added += batch_files
+                    all_files.extend(batch_files)
                     
                     # 更新进度
-                    progress = min(100, int((i + len(batch)) / total_links * 100))
-                    self.app.root.after(0, lambda p=progress: [
+                    done = i + len(batch)
+                    progress = min(100, int(done / total_links * 100))
+                    self.app.root.after(0, lambda p=progress, n=done: [
                         progress_var.set(p),
-                        status_var.set(f"已处理 {i + len(batch)}/{total_links} 个链接...")
+                        status_var.set(f"已处理 {n}/{total_links} 个链接...")
                     ])
                 
                 # 处理完成，发送结果
@@ -278,54 +298,49 @@ class LinkPanel:
                     "success_count": success_count,
                     "total_count": total_links,
                     "error_messages": error_messages,
-                    "total_files_added": total_files_added
+                    "all_files": all_files
                 }
-                result_queue.put(("success", result))
+                post_result("success", result)
                 
             except Exception as e:
-                result_queue.put(("error", str(e)))
+                post_result("error", str(e))
         
-        # 启动后台线程
-        thread = threading.Thread(target=process_link)
-        thread.daemon = True
-        thread.start()
-        
-        # 定期检查结果队列
-        def check_result():
-            try:
-                status, data = result_queue.get_nowait()
+        # 在主线程显示处理结果
+        def show_result(status, data):
+            # 关闭进度窗口
+            if progress_window.winfo_exists():
+                progress_window.destroy()
                 
-                # 关闭进度窗口
-                if progress_window.winfo_exists():
-                    progress_window.destroy()
+            if status == "success" and cancel_event.is_set():
+                # 解析完成前已取消，不再添加
+                messagebox.showinfo("已取消", "链接处理已取消")
                 
-                if status == "success":
-                    # 显示成功结果
-                    if data["success_count"] > 0:
-                        result_message = f"成功处理 {data["success_count"]}/{data["total_count"]} 个链接，共添加 {data["total_files_added"]} 个文件"
-                        if data["error_messages"]:
-                            result_message += "\n\n以下链接处理失败:\n" + "\n".join(data["error_messages"][:5])
-                            if len(data["error_messages"]) > 5:
-                                result_message += f"\n...等共 {len(data['error_messages'])} 个错误"
-                        messagebox.showinfo("处理完成", result_message)
-                    else:
-                        error_msg = "所有链接处理失败:\n" + "\n".join(data["error_messages"][:5])
+            elif status == "success":
+                if data["success_count"] > 0:
+                    # 在主线程一次性添加所有文件，再显示成功结果
+                    data["total_files_added"] = self.app.add_parsed_files(data["all_files"])
+                    result_message = f"成功处理 {data["success_count"]}/{data["total_count"]} 个链接，共添加 {data["total_files_added"]} 个文件"
+                    if data["error_messages"]:
+                        result_message += "\n\n以下链接处理失败:\n" + "\n".join(data["error_messages"][:5])
                         if len(data["error_messages"]) > 5:
-                            error_msg += f"\n...等共 {len(data['error_messages'])} 个错误"
-                        messagebox.showerror("处理失败", error_msg)
+                            result_message += f"\n...等共 {len(data['error_messages'])} 个错误"
+                    messagebox.showinfo("处理完成", result_message)
+                else:
+                    error_msg = "所有链接处理失败:\n" + "\n".join(data["error_messages"][:5])
+                    if len(data["error_messages"]) > 5:
+                        error_msg += f"\n...等共 {len(data['error_messages'])} 个错误"
+                    messagebox.showerror("处理失败", error_msg)
                 
-                elif status == "error":
-                    messagebox.showerror("错误", f"处理链接时出错: {data}")
+            elif status == "error":
+                messagebox.showerror("错误", f"处理链接时出错: {data}")
                 
-                elif status == "cancelled":
-                    messagebox.showinfo("已取消", "链接处理已取消")
-                
-            except queue.Empty:
-                if progress_window.winfo_exists():
-                    self.app.root.after(100, check_result)
+            elif status == "cancelled":
+                messagebox.showinfo("已取消", "链接处理已取消")
         
-        # 开始检查结果
-        self.app.root.after(100, check_result)
+        # 启动后台线程
+        thread = threading.Thread(target=process_link)
+        thread.daemon = True
+        thread.start()
     
     def _update_progress(self, status_var, message, window, update_progress=False, progress_value=0, progress_bar=None):
         """更新进度条和状态信息"""
@@ -337,17 +352,19 @@ class LinkPanel:
                 progress_bar['value'] = progress_value
     
     def _extract_links(self, content):
-        """从文本内容中提取链接"""
-        from utils.link_parser import LinkParser
-        
-        # 按行分割内容
-        lines = content.strip().split('\n')
+        """从文本内容中提取链接，重复的链接只保留第一次出现的"""
+        # 粘贴内容中常有重复的链接，同一行只验证、解析一次
+        validated = set()
+        validate = LinkParser.validate_link_format
         
-        # 提取有效链接
+        # 按行提取有效链接
         valid_links = []
-        for line in lines:
+        for line in content.splitlines():
             line = line.strip()
-            if line and LinkParser.validate_link_format(line)[0]:
+            if not line or line in validated:
+                continue
+            validated.add(line)
+            if validate(line)[0]:
                 valid_links.append(line)
         
         return valid_links
\ No newline at end of file
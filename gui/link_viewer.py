@@ -15,13 +15,35 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from utils.link_parser import LinkParser
-from collections import OrderedDict
+from gui.tree_freezer import TreeFreezer
+from utils.link_parser import LINK_PREFIXES, LinkParser
+from operator import itemgetter
+
+# 各单位的倒数，换算时只做一次乘法（2的幂次换算没有精度损失）
+_INV_KIB = 1.0 / (1 << 10)
+_INV_MIB = 1.0 / (1 << 20)
+_INV_GIB = 1.0 / (1 << 30)
+
+
+def _fmt_size(size):
+    """按位数选择合适的单位格式化文件大小"""
+    bits = size.bit_length()
+    if bits <= 10:
+        return f"{size} B"
+    if bits <= 20:
+        return f"{size * _INV_KIB:.2f} KB"
+    if bits <= 30:
+        return f"{size * _INV_MIB:.2f} MB"
+    return f"{size * _INV_GIB:.2f} GB"
 
 
 class LinkViewer(ttk.Toplevel):
     """秒链查看器弹窗"""
     
+    # 弹窗尺寸
+    WIDTH = 800
+    HEIGHT = 560
+    
     def __init__(self, parent, app=None):
         """
         初始化秒链查看器弹窗
@@ -32,7 +54,6 @@ class LinkViewer(ttk.Toplevel):
         """
         super().__init__(parent)
         self.title("秒链查看器")
-        self.geometry("800x560")
         self.transient(parent)  # 设为父窗口的子窗口
         self.grab_set()  # 设为模态窗口
         
@@ -50,14 +71,16 @@ class LinkViewer(ttk.Toplevel):
         
         # 数据存储
         self.all_links = []  # 存储所有解析的链接
+        self._sorted_cache = None  # 按当前排序方式排好的all_links，翻页时直接复用
+        self._sorted_key = None  # 缓存对应的(排序列, 是否逆序)
+        self._iid_to_link = {}  # 当前页各行iid对应的完整秒链，不占用Tk的tag
+        self._total_size_bytes = 0  # all_links的总大小，添加链接时累加
         
-        # 窗口居中显示
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
+        # 窗口居中显示，尺寸已知，无需先刷新布局再读取窗口大小
+        width, height = self.WIDTH, self.HEIGHT
         x = (self.winfo_screenwidth() // 2) - (width // 2)
         y = (self.winfo_screenheight() // 2) - (height // 2)
-        self.geometry(f"+{x}+{y}")
+        self.geometry(f"{width}x{height}+{x}+{y}")
         
         # 创建UI组件
         self.create_widgets()
@@ -104,12 +127,13 @@ class LinkViewer(ttk.Toplevel):
         self.tree.column('link', width=300, stretch=True)  # 秒链列自动扩展
         
         # 滚动条
-        scrollbar = ttk.Scrollbar(
+        self.scrollbar = ttk.Scrollbar(
             tree_container,
             orient=VERTICAL,
             command=self.tree.yview
         )
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self._freezer = TreeFreezer(self.tree, self.scrollbar)
         
         # 按钮框架（右侧）
         btn_frame = ttk.Frame(tree_container)
@@ -144,7 +168,7 @@ class LinkViewer(ttk.Toplevel):
         
         # 布局
         self.tree.pack(side=LEFT, fill=BOTH, expand=True)
-        scrollbar.pack(side=RIGHT, fill=Y)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
         
         # 创建分页控制面板
         pagination_frame = ttk.Frame(self.frame)
@@ -189,12 +213,34 @@ class LinkViewer(ttk.Toplevel):
         page_size_combo.pack(side=LEFT)
         page_size_combo.bind("<<ComboboxSelected>>", self.on_page_size_change)
     
-    def parse_and_show_links(self, link_text):
+    def parse_and_show_links(self, link_text, parse=LinkParser.parse_link):
         """
         解析并显示秒链
         
         Args:
             link_text: 包含秒链的文本
+            parse: 解析函数，返回值与LinkParser.parse_link相同，可传入带缓存的版本
+        """
+        # 解析链接
+        try:
+            parsed_links, error = parse(link_text)
+            if error:
+                self.clear_viewer()
+                messagebox.showerror("解析错误", error)
+                return
+        except Exception as e:
+            self.clear_viewer()
+            messagebox.showerror("解析错误", f"解析秒链时出错: {str(e)}")
+            return
+        
+        self.show_files(parsed_links)
+    
+    def show_files(self, files):
+        """
+        直接显示文件信息，已有解析结果时无需再拼接成秒链文本解析一遍
+        
+        Args:
+            files: 文件信息列表，每个需包含path,size,etag
         """
         # 清空现有内容
         self.clear_viewer()
@@ -203,48 +249,33 @@ class LinkViewer(ttk.Toplevel):
         self.deiconify()
         self.lift()
         
-        # 解析链接
         try:
-            parsed_links, error = LinkParser.parse_link(link_text)
-            if error:
-                messagebox.showerror("解析错误", error)
-                return
-            
-            # 处理解析的链接
+            # 处理文件信息，每个文件的秒链批量生成
             self.all_links = []
-            for link in parsed_links:
+            total_size = 0
+            for link, full_link in zip(files, LinkParser.generate_links(files)):
                 # 获取文件名
-                name = link['path'].split('/')[-1] if '/' in link['path'] else link['path']
+                name = link['path'].rpartition('/')[2]
                 
                 # 格式化文件大小（自动选择合适的单位）
                 size = int(link['size'])
-                if size < 1024:
-                    size_str = f"{size} B"
-                elif size < 1024 * 1024:
-                    size_str = f"{size/1024:.2f} KB"
-                elif size < 1024 * 1024 * 1024:
-                    size_str = f"{size/1024/1024:.2f} MB"
-                else:
-                    size_str = f"{size/1024/1024/1024:.2f} GB"
+                size_str = _fmt_size(size)
+                total_size += size
                 
-                # 生成完整秒链格式
-                file_info = {
-                    'path': link['path'],
-                    'size': link['size'],
-                    'etag': link['etag']
-                }
-                full_link = LinkParser.generate_link([file_info])
                 # 显示时截断秒链，保留前30个字符
                 display_link = full_link[:30] + "..." if len(full_link) > 30 else full_link
                 
-                # 存储链接信息
+                # 存储链接信息，排序用的小写键预先算好
                 self.all_links.append({
                     'name': name,
                     'size_str': size_str,
                     'size_bytes': size,
                     'display_link': display_link,
-                    'full_link': full_link
+                    'full_link': full_link,
+                    'name_key': name.lower(),
+                    'link_key': display_link.lower()
                 })
+            self._total_size_bytes = total_size
             
             # 默认按名称排序
             self.sort_column = "name"
@@ -281,36 +312,53 @@ class LinkViewer(ttk.Toplevel):
         end_idx = min(start_idx + self.page_size, total_links)
         current_page_links = sorted_links[start_idx:end_idx]
         
-        # 清空现有项目
-        self.reset_view()
-        
-        # 添加当前页的链接
-        for link in current_page_links:
-            self.tree.insert(
-                '',
-                'end',
-                values=(link['name'], link['size_str'], link['display_link']),
-                tags=(link['full_link'],)  # 存储完整秒链作为tag
-            )
+        self.freeze()
+        try:
+            # 清空现有项目
+            self.reset_view()
+            
+            # 添加当前页的链接，完整秒链按iid保存在字典中
+            iid_to_link = self._iid_to_link
+            for link in current_page_links:
+                iid = self.tree.insert(
+                    '',
+                    'end',
+                    values=(link['name'], link['size_str'], link['display_link'])
+                )
+                iid_to_link[iid] = link['full_link']
+        finally:
+            self.thaw()
         
         # 更新分页状态
         self.update_pagination_status(total_links)
     
     def sort_links(self, links):
-        """对链接进行排序"""
+        """
+        对链接进行排序
+        
+        排序方式不变时直接返回上次的结果，翻页和修改每页数量不再重新排序全部链接
+        """
         if not self.sort_column:
             return links
         
+        key = (self.sort_column, self.sort_reverse)
+        if self._sorted_cache is not None and self._sorted_key == key:
+            return self._sorted_cache
+        
         reverse = self.sort_reverse
         
         if self.sort_column == "name":
-            return sorted(links, key=lambda x: x['name'].lower(), reverse=reverse)
+            result = sorted(links, key=itemgetter('name_key'), reverse=reverse)
         elif self.sort_column == "size":
-            return sorted(links, key=lambda x: x['size_bytes'], reverse=reverse)
+            result = sorted(links, key=itemgetter('size_bytes'), reverse=reverse)
         elif self.sort_column == "link":
-            return sorted(links, key=lambda x: x['display_link'].lower(), reverse=reverse)
+            result = sorted(links, key=itemgetter('link_key'), reverse=reverse)
+        else:
+            return links
         
-        return links
+        self._sorted_cache = result
+        self._sorted_key = key
+        return result
     
     def sort_tree(self, column):
         """
@@ -332,10 +380,20 @@ class LinkViewer(ttk.Toplevel):
         # 更新显示
         self.update_view()
     
+    def freeze(self):
+        """冻结树形视图，批量增删行前调用，必须与thaw()成对使用"""
+        self._freezer.freeze()
+    
+    def thaw(self):
+        """解除冻结，恢复显示列和滚动条"""
+        self._freezer.thaw()
+    
     def reset_view(self):
-        """清空树形视图"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """清空树形视图，一次删除所有行"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._iid_to_link.clear()
     
     def update_pagination_status(self, total_links):
         """更新分页状态"""
@@ -405,10 +463,9 @@ class LinkViewer(ttk.Toplevel):
         # 获取选中项的数据并构建完整秒链
         links_to_export = []
         for item in selected_items:
-            item_data = self.tree.item(item)
-            # 从tag中获取完整秒链
-            full_link = item_data['tags'][0] if item_data['tags'] else item_data['values'][2]
-            if isinstance(full_link, str) and (full_link.startswith("123FSLink") or full_link.startswith("123FLCPV2")):
+            # 按iid取出完整秒链
+            full_link = self._iid_to_link.get(item)
+            if full_link and full_link.startswith(LINK_PREFIXES):
                 links_to_export.append(full_link)
         
         # 将完整秒链复制到剪贴板
@@ -421,9 +478,8 @@ class LinkViewer(ttk.Toplevel):
             messagebox.showerror("导出错误", f"导出失败: {str(e)}")
     
     def save_json_file(self):
-        import json
+        from utils.json_handler import dump_json
         from tkinter import filedialog, messagebox
-        from collections import OrderedDict
         # 当前展示的所有链接
         links = self.all_links if hasattr(self, 'all_links') else []
         if not links:
@@ -432,31 +488,6 @@ class LinkViewer(ttk.Toplevel):
         # 构造标准 files 列表
         export_files = []
         for f in links:
-            # 提取size
-            size = 0
-            if 'size_bytes' in f:
-                size = int(f['size_bytes'])
-            elif 'size' in f:
-                try:
-                    size = int(f['size'])
-                except Exception:
-                    size = 0
-            elif 'size_str' in f:
-                s = f['size_str'].strip().upper()
-                try:
-                    if s.endswith('GB'):
-                        size = int(float(s[:-2].strip()) * 1024 * 1024 * 1024)
-                    elif s.endswith('MB'):
-                        size = int(float(s[:-2].strip()) * 1024 * 1024)
-                    elif s.endswith('KB'):
-                        size = int(float(s[:-2].strip()) * 1024)
-                    elif s.endswith('B'):
-                        size = int(float(s[:-1].strip()))
-                    else:
-                        # 如果没有单位，尝试直接解析为数字
-                        size = int(float(s))
-                except (ValueError, TypeError):
-                    size = 0
             # 提取etag
             etag = f.get('etag', '')
             if not etag and 'full_link' in f:
@@ -465,43 +496,40 @@ class LinkViewer(ttk.Toplevel):
                     etag = parts[0].split('$')[-1]
             export_files.append({
                 'path': str(f.get('path', f.get('name', ''))).split('\n')[0],
-                'size': str(size),
+                'size': str(f['size_bytes']),
                 'etag': etag
             })
-        # 统计字段
+        # 统计字段，总大小在显示链接时已累加
         total_files = len(export_files)
-        total_size = sum(int(f['size']) for f in export_files)
-        if total_size < 1024:
-            formatted_size = f"{total_size} B"
-        elif total_size < 1024 * 1024:
-            formatted_size = f"{total_size/1024:.2f} KB"
-        elif total_size < 1024 * 1024 * 1024:
-            formatted_size = f"{total_size/1024/1024:.2f} MB"
-        else:
-            formatted_size = f"{total_size/1024/1024/1024:.2f} GB"
-        # 用 OrderedDict 保证字段顺序
-        export_json = OrderedDict()
-        export_json['scriptVersion'] = '1.0.1'
-        export_json['exportVersion'] = '1.0'
-        export_json['usesBase62EtagsInExport'] = True
-        export_json['commonPath'] = ''
-        export_json['totalFilesCount'] = total_files
-        export_json['totalSize'] = total_size
-        export_json['formattedTotalSize'] = formatted_size
-        export_json['files'] = export_files
+        total_size = self._total_size_bytes
+        formatted_size = _fmt_size(total_size)
+        # 普通dict即按插入顺序输出字段
+        export_json = {
+            'scriptVersion': '1.0.1',
+            'exportVersion': '1.0',
+            'usesBase62EtagsInExport': True,
+            'commonPath': '',
+            'totalFilesCount': total_files,
+            'totalSize': total_size,
+            'formattedTotalSize': formatted_size,
+            'files': export_files
+        }
         save_path = filedialog.asksaveasfilename(
             title="保存JSON文件",
             defaultextension=".json",
             filetypes=[("JSON文件", "*.json")]
         )
         if save_path:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(export_json, f, ensure_ascii=False, indent=2)
+            # 已安装orjson时由其整体序列化，否则边编码边写入，使用1MiB写缓冲
+            with open(save_path, 'wb', buffering=1 << 20) as f:
+                dump_json(export_json, f)
             messagebox.showinfo("完成", f"已保存JSON文件到: {save_path}")
     
     def clear_viewer(self):
         """清空树状图"""
         self.all_links = []
+        self._sorted_cache = None
+        self._total_size_bytes = 0
         self.reset_view()
         self.sort_column = None
         self.sort_reverse = False
@@ -2,9 +2,13 @@ import tkinter as tk
 import ttkbootstrap as ttk
 
 class SearchBar(ttk.Frame):
-    def __init__(self, parent, on_search=None, placeholder='搜索秒链...', *args, **kwargs):
+    def __init__(self, parent, on_search=None, placeholder='搜索秒链...', *args, delay_ms=150, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.on_search = on_search
+        # 搜索防抖：delay_ms内的多次触发只执行最后一次，为0时立即执行
+        self.delay_ms = delay_ms
+        self._pending_after = None
+        self._last_value = ''
         self.var = tk.StringVar()
         self.entry = ttk.Entry(self, textvariable=self.var, width=28)
         self.entry.pack(side='left', fill='x', expand=True, padx=(0, 4))
@@ -12,6 +16,7 @@ class SearchBar(ttk.Frame):
         self.entry.bind('<FocusIn>', self._clear_placeholder)
         self.entry.bind('<FocusOut>', self._add_placeholder)
         self.entry.bind('<Return>', self._trigger_search)
+        self.entry.bind('<KeyRelease>', self._on_key_release)
         self.placeholder = placeholder
         self.has_placeholder = True
         btn = ttk.Button(self, text='搜索', bootstyle='info', width=7, command=self._trigger_search)
@@ -29,16 +34,41 @@ class SearchBar(ttk.Frame):
             self.entry.insert(0, self.placeholder)
             self.has_placeholder = True
 
-    def _trigger_search(self, event=None):
+    def _current_value(self):
         value = self.var.get().strip()
         # 只在内容等于placeholder时才视为空
         if self.has_placeholder and value == self.placeholder:
             value = ''
+        return value
+
+    def _on_key_release(self, event=None):
+        # 边输入边搜索，方向键等没有改变内容的按键不触发
+        if self._current_value() != self._last_value:
+            self._trigger_search()
+
+    def _trigger_search(self, event=None):
+        self._cancel_pending()
+        if self.delay_ms > 0:
+            self._pending_after = self.after(self.delay_ms, self._run_search)
+        else:
+            self._run_search()
+
+    def _cancel_pending(self):
+        if self._pending_after is not None:
+            self.after_cancel(self._pending_after)
+            self._pending_after = None
+
+    def _run_search(self):
+        self._pending_after = None
+        value = self._current_value()
+        self._last_value = value
         if self.on_search:
             self.on_search(value)
 
     def _clear(self):
+        self._cancel_pending()
         self.var.set('')
         self._add_placeholder()
+        self._last_value = ''
         if self.on_search:
             self.on_search('') 
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+树形视图冻结模块
+
+批量增删Treeview行时，暂时隐藏所有显示列并断开滚动条回调，
+避免每插入一行都触发列布局和滚动条刷新。
+"""
+
+
+class TreeFreezer:
+    """冻结/解冻一个带滚动条的Treeview，freeze()与thaw()必须成对使用"""
+
+    __slots__ = ('tree', 'scrollbar', '_saved')
+
+    def __init__(self, tree, scrollbar):
+        """
+        Args:
+            tree: 要冻结的Treeview
+            scrollbar: 与其联动的纵向滚动条
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self._saved = None  # 冻结期间保存的(显示列, 滚动条回调)
+
+    def freeze(self):
+        """冻结树形视图，已冻结时不重复冻结"""
+        if self._saved is not None:
+            return
+        self._saved = (self.tree.cget('displaycolumns'), self.tree.cget('yscrollcommand'))
+        self.tree.configure(displaycolumns=(), yscrollcommand='')
+
+    def thaw(self):
+        """解除冻结，恢复显示列和滚动条，并同步一次滚动条位置"""
+        if self._saved is None:
+            return
+        displaycolumns, yscrollcommand = self._saved
+        self._saved = None
+        self.tree.configure(displaycolumns=displaycolumns, yscrollcommand=yscrollcommand)
+        self.scrollbar.set(*self.tree.yview())
@@ -18,6 +18,24 @@ from gui.search_bar import SearchBar
 import re
 import tkinter.font as tkFont
 from gui.dir_filter_menu import DirFilterMenu
+from gui.tree_freezer import TreeFreezer
+
+# 搜索时去除的年份、分辨率、编码/格式等干扰词，模块加载时编译一次
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b', re.IGNORECASE)
+_RESOLUTION_RE = re.compile(r'(480p|720p|1080p|2160p|4k)', re.IGNORECASE)
+_CODEC_RE = re.compile(r'(h265|h264|aac|acc|flac|mp3|hevc|x264|x265|ac3|dts|ddp|mkv|mp4|avi|wmv|mov|ts|mpeg|mpg)', re.IGNORECASE)
+_SPACES_RE = re.compile(r'\s+')
+
+
+def _clean_name(s):
+    """去除年份、分辨率、编码等干扰词，用于搜索匹配"""
+    if not s:
+        return ''
+    s = _YEAR_RE.sub('', s)  # 年份
+    s = _RESOLUTION_RE.sub('', s)  # 分辨率
+    s = _CODEC_RE.sub('', s)  # 编码/格式
+    s = _SPACES_RE.sub(' ', s)  # 多余空格
+    return s.strip()
 
 
 class TreeView:
@@ -42,6 +60,10 @@ class TreeView:
         # 创建视图
         self.create_view()
         self.is_reversed = False  # 记录当前是否为反转顺序
+        self._dir_menu = None  # 缓存的目录筛选菜单，文件列表变化时重建
+        self._dir_menu_count = 0
+        self._rendered_values = {}  # 当前页已渲染行的显示内容，用于差异刷新
+        self._freezer = TreeFreezer(self.tree, self.scrollbar)
     
     def create_view(self):
         """
@@ -120,6 +142,7 @@ class TreeView:
         scrollbar = ttk.Scrollbar(tree_container, orient=VERTICAL, command=self.tree.yview)
         scrollbar.pack(side=RIGHT, fill=Y)
         self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = scrollbar
         self.tree.pack(side=LEFT, fill=BOTH, expand=True)
 
         # 创建分页控制面板
@@ -187,7 +210,7 @@ class TreeView:
         # 获取所有文件（保持原始顺序，不排序）
         all_files = self.app.json_data.files
         # 目录下拉菜单自动生成（只更新选项，不重建控件）
-        dir_menu = DirFilterMenu(self.app.json_data.files)
+        dir_menu = self.get_dir_menu()
         menu_options = dir_menu.get_menu_options()
         combo_values = []
         value_to_label = {}
@@ -216,16 +239,7 @@ class TreeView:
         # 目录筛选后再进行搜索过滤
         if hasattr(self, 'search_value') and self.search_value:
             keyword = self.search_value.lower()
-            def clean_name(s):
-                if not s:
-                    return ''
-                # 去除年份、分辨率、编码等
-                s = re.sub(r'\b(19|20)\d{2}\b', '', s, flags=re.IGNORECASE)  # 年份
-                s = re.sub(r'(480p|720p|1080p|2160p|4k)', '', s, flags=re.IGNORECASE)  # 分辨率
-                s = re.sub(r'(h265|h264|aac|acc|flac|mp3|hevc|x264|x265|ac3|dts|ddp|mkv|mp4|avi|wmv|mov|ts|mpeg|mpg)', '', s, flags=re.IGNORECASE)  # 编码/格式
-                s = re.sub(r'\s+', ' ', s)  # 多余空格
-                return s.strip()
-            all_files = [f for f in all_files if keyword in clean_name(f['path'].lower()) or keyword in clean_name(f.get('name', '').lower())]
+            all_files = [f for f in all_files if keyword in _clean_name(f['path'].lower()) or keyword in _clean_name(f.get('name', '').lower())]
         # 文件大小筛选
         if hasattr(self, 'size_min_var') and hasattr(self, 'size_max_var') and hasattr(self, 'size_unit_var'):
             min_val = self.size_min_var.get().strip()
@@ -270,9 +284,8 @@ class TreeView:
         end_idx = min(start_idx + self.page_size, total_files)
         current_page_files = all_files[start_idx:end_idx]
         self.current_page_files = current_page_files  # 供全选用
-        # 清空现有项目
-        self.reset_view()
-        # 添加当前页的文件
+        # 生成当前页的行数据
+        rows = []
         for file in current_page_files:
             # 判断当前目录筛选
             select_label = self.dir_level_var.get()
@@ -292,18 +305,68 @@ class TreeView:
             else:
                 size_str = f"{size/1024/1024/1024:.2f} GB"
             etag = file.get('etag', '')
-            self.tree.insert("", "end", iid=file['path'], values=(name, size_str, etag))
+            rows.append((file['path'], (name, size_str, etag)))
+        # 只对有变化的行做增删
+        self._render_rows(rows)
         # 更新分页状态
         self.update_pagination_status(total_files)
 
+    def _render_rows(self, rows):
+        """
+        按差异刷新当前页：删除离开本页的行，插入新出现的行，其余行保持不动
+        
+        Args:
+            rows: [(iid, values), ...]，按显示顺序排列
+        """
+        current = self.tree.get_children()
+        target = dict(rows)
+        kept = [iid for iid in current if iid in target]
+        kept_set = set(kept)
+        rendered = self._rendered_values
+        # 保留行的相对顺序或内容有变化时，退回整页重建
+        if kept != [iid for iid, _ in rows if iid in kept_set] or \
+                any(rendered.get(iid) != target[iid] for iid in kept):
+            self.reset_view()
+            kept_set = set()
+        else:
+            stale = [iid for iid in current if iid not in target]
+            if stale:
+                self.tree.delete(*stale)
+        for index, (iid, values) in enumerate(rows):
+            if iid not in kept_set:
+                self.tree.insert("", index, iid=iid, values=values)
+        self._rendered_values = target
+
+    def get_dir_menu(self):
+        """
+        获取目录筛选菜单，文件列表未变化时复用已分桶的结果
+        """
+        files = self.app.json_data.files
+        dir_menu = self._dir_menu
+        if dir_menu is None or dir_menu.files is not files or len(files) != self._dir_menu_count:
+            dir_menu = DirFilterMenu(files)
+            self._dir_menu = dir_menu
+            self._dir_menu_count = len(files)
+        return dir_menu
+
     def on_dir_select(self, value):
         self.dir_dropdown.var.set(value)
         self.update_view()
     
+    def freeze(self):
+        """冻结树形视图，批量增删行前调用，必须与thaw()成对使用"""
+        self._freezer.freeze()
+    
+    def thaw(self):
+        """解除冻结，恢复显示列和滚动条"""
+        self._freezer.thaw()
+    
     def reset_view(self):
         """清空树形视图"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._rendered_values = {}
     
     def clear_view(self):
         """清空视图并重置状态"""
@@ -326,7 +389,7 @@ class TreeView:
                 # 重新调用 update_view 保证顺序和分页一致
                 self.update_view()
                 return
-            self.reset_view()
+            rows = []
             for file in self.current_page_files:
                 name = file.get('name', file['path'])
                 size = int(file['size']) if 'size' in file else 0
@@ -339,7 +402,13 @@ class TreeView:
                 else:
                     size_str = f"{size/1024/1024/1024:.2f} GB"
                 etag = file.get('etag', '')
-                self.tree.insert("", "end", iid=file['path'], values=(name, size_str, etag))
+                rows.append((file['path'], (name, size_str, etag)))
+            # 整页顺序反转，冻结视图后一次性重建
+            self.freeze()
+            try:
+                self._render_rows(rows)
+            finally:
+                self.thaw()
             return
         # 其他列保持原有排序逻辑
         if self.sort_column == column:
@@ -396,8 +465,7 @@ class TreeView:
             file = self.app.json_data.get_file_by_path(item)
             if file:
                 filenames.append(file.get('name', file['path']))
-        self.app.root.clipboard_clear()
-        self.app.root.clipboard_append("\n".join(filenames))
+        self.app.copy_to_clipboard("\n".join(filenames))
     
     def copy_full_path(self):
         """复制选中项的完整路径到剪贴板"""
@@ -406,8 +474,7 @@ class TreeView:
             return
         # 获取所有选中项的路径
         paths = [item for item in selected]  # iid就是path
-        self.app.root.clipboard_clear()
-        self.app.root.clipboard_append("\n".join(paths))
+        self.app.copy_to_clipboard("\n".join(paths))
     
     def copy_etag(self):
         """复制选中项的ETag到剪贴板"""
@@ -419,8 +486,7 @@ class TreeView:
             file = self.app.json_data.get_file_by_path(item)
             if file:
                 etags.append(file.get('etag', ''))
-        self.app.root.clipboard_clear()
-        self.app.root.clipboard_append("\n".join(etags))
+        self.app.copy_to_clipboard("\n".join(etags))
     
     def export_selected(self):
         """导出选中项的链接"""
@@ -434,11 +500,8 @@ class TreeView:
                 files.append(file)
         if not files:
             return
-        # 生成秒链（如有自定义生成逻辑可调用 app.export_selected_links）
-        from utils.link_parser import LinkParser
-        link = LinkParser.generate_link(files)
-        self.app.root.clipboard_clear()
-        self.app.root.clipboard_append(link)
+        # 生成秒链并复制到剪贴板
+        link = self.app.export_selected_links(files)
         export_dialog = tk.Toplevel(self.app.root)
         export_dialog.title("导出链接")
         export_dialog.geometry("600x300")
@@ -497,10 +560,8 @@ class TreeView:
         for item in selected:
             self.tree.delete(item)
         if removed > 0 and self.app.current_file:
-            success, error_msg = self.app.json_data.save(self.app.current_file)
-            if not success:
-                messagebox.showerror("保存失败", f"保存文件时出错: {error_msg}")
-                return
+            # 在后台保存，出错时由app提示
+            self.app.schedule_save()
         messagebox.showinfo("删除成功", f"已删除 {removed} 个链接")
     
     def export_all_links(self):
@@ -512,8 +573,7 @@ class TreeView:
             messagebox.showwarning("警告", "请先选中要导出的秒链")
             return
         link = self.app.export_selected_links(selected_files)
-        self.app.root.clipboard_clear()
-        self.app.root.clipboard_append(link)
+        self.app.copy_to_clipboard(link)
         export_dialog = tk.Toplevel(self.app.root)
         export_dialog.title("导出链接")
         export_dialog.geometry("600x300")
@@ -553,8 +613,7 @@ class TreeView:
             all_files = self.current_page_files
         
         link = self.app.export_selected_links(all_files)
-        self.app.root.clipboard_clear()
-        self.app.root.clipboard_append(link)
+        self.app.copy_to_clipboard(link)
         
         export_dialog = tk.Toplevel(self.app.root)
         export_dialog.title("导出全部链接")
@@ -590,13 +649,11 @@ class TreeView:
         files = self.app.json_data.files
         files.sort(key=lambda f: ("/" in f["path"], natural_key(f.get('name', f['path']))))
         self.app.json_data.files = files
-        # 自动保存
-        success, error_msg = self.app.json_data.save(self.app.current_file)
+        self._dir_menu = None  # 原地排序后分桶顺序失效
+        # 自动保存（后台进行，出错时由app提示）
+        self.app.schedule_save()
         self.update_view()
-        if success:
-            messagebox.showinfo("排序完成", "已按规则排序并保存！")
-        else:
-            messagebox.showerror("保存失败", f"排序已完成，但保存文件时出错: {error_msg}")
+        messagebox.showinfo("排序完成", "已按规则排序，正在后台保存，保存失败时会另行提示")
     
     def update_pagination_status(self, total_files):
         """
@@ -656,22 +713,13 @@ class TreeView:
 
 
     def save_json_file(self):
-        import json
+        from utils.json_handler import dump_json
         from tkinter import filedialog, messagebox
         # 获取当前过滤后的文件列表
         all_files = self.app.json_data.files if self.app.json_data and self.app.json_data.files else []
         if hasattr(self, 'search_value') and self.search_value:
             keyword = self.search_value.lower()
-            def clean_name(s):
-                if not s:
-                    return ''
-                import re
-                s = re.sub(r'\b(19|20)\d{2}\b', '', s, flags=re.IGNORECASE)
-                s = re.sub(r'(480p|720p|1080p|2160p|4k)', '', s, flags=re.IGNORECASE)
-                s = re.sub(r'(h265|h264|aac|acc|flac|mp3|hevc|x264|x265|ac3|dts|ddp|mkv|mp4|avi|wmv|mov|ts|mpeg|mpg)', '', s, flags=re.IGNORECASE)
-                s = re.sub(r'\s+', ' ', s)
-                return s.strip()
-            all_files = [f for f in all_files if keyword in clean_name(f['path'].lower()) or keyword in clean_name(f.get('name', '').lower())]
+            all_files = [f for f in all_files if keyword in _clean_name(f['path'].lower()) or keyword in _clean_name(f.get('name', '').lower())]
         if not all_files:
             messagebox.showwarning("提示", "当前没有可保存的秒链文件")
             return
@@ -738,8 +786,9 @@ class TreeView:
             filetypes=[("JSON文件", "*.json")]
         )
         if save_path:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(export_json, f, ensure_ascii=False, indent=2)
+            # 已安装orjson时由其整体序列化，否则边编码边写入，使用1MiB写缓冲
+            with open(save_path, 'wb', buffering=1 << 20) as f:
+                dump_json(export_json, f)
             messagebox.showinfo("完成", f"已保存JSON文件到: {save_path}")
 
     def on_tree_mouse_down(self, event):
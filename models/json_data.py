@@ -11,8 +11,9 @@ JSON数据模型模块
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Iterable
 
 from utils.json_handler import read_json_file, write_json_file, is_valid_123_json
 from utils.file_sorter import sort_json_data
@@ -41,6 +42,13 @@ class JsonData:
         # 自动补全统计字段
         try:
             from utils.json_handler import fix_json_fields, write_json_file
+            # 记录补全前的统计字段和各文件大小，只有内容确实变化时才写回文件
+            header_keys = ('scriptVersion', 'exportVersion', 'usesBase62EtagsInExport', 'commonPath')
+            had_header = all(key in data for key in header_keys)
+            stat_keys = ('totalFilesCount', 'totalSize', 'formattedTotalSize')
+            old_stats = [data.get(key) for key in stat_keys]
+            old_files = data.get('files')
+            old_sizes = [file.get('size') for file in old_files] if isinstance(old_files, list) else None
             data, changed = fix_json_fields(data)
             # 新增：补全头部字段
             if 'scriptVersion' not in data:
@@ -76,7 +84,9 @@ class JsonData:
             else:
                 formatted_size = f"{total_size/1024/1024/1024:.2f} GB"
             data['formattedTotalSize'] = formatted_size
-            changed = True
+            changed = (changed or not had_header
+                       or old_stats != [data[key] for key in stat_keys]
+                       or old_sizes != [file['size'] for file in files])
             if changed:
                 write_json_file(filepath, data)
         except Exception as e:
@@ -111,6 +121,23 @@ class JsonData:
         
         return success, error_msg
     
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        生成用于后台保存的数据快照
+        
+        Returns:
+            Optional[Dict[str, Any]]: 数据的浅拷贝（文件列表也复制一份），没有数据时返回None
+        """
+        if not self.data:
+            return None
+        
+        # 更新文件总数和总大小
+        self.update_totals()
+        
+        data = dict(self.data)
+        data['files'] = list(self.files)
+        return data
+    
     def create_new(self) -> str:
         """
         创建新的JSON数据
@@ -148,20 +175,37 @@ class JsonData:
         Args:
             new_files: 新文件信息列表
             
+        Returns:
+            int: 添加的文件数量
+        """
+        return self.add_files_bulk(new_files)
+    
+    def add_files_bulk(self, new_files: Iterable[Dict[str, Any]]) -> int:
+        """
+        批量添加新文件，只做一次去重、一次扩展和一次排序
+        
+        Args:
+            new_files: 新文件信息的可迭代对象，可来自多个链接
+            
         Returns:
             int: 添加的文件数量
         """
         if not self.data:
             return 0
         
-        added_count = 0
         existing_paths = {file['path'] for file in self.files}
+        unique_files = []
         
         for file in new_files:
-            if file['path'] not in existing_paths:
-                self.files.append(file)
-                existing_paths.add(file['path'])
-                added_count += 1
+            path = file['path']
+            if path not in existing_paths:
+                existing_paths.add(path)
+                unique_files.append(file)
+        
+        if not unique_files:
+            return 0
+        
+        self.files.extend(unique_files)
         
         # 排序文件列表
         result = sort_json_data(self.data)
@@ -172,7 +216,7 @@ class JsonData:
         # 更新总计
         self.update_totals()
         
-        return added_count
+        return len(unique_files)
     
     def get_file_by_path(self, path: str) -> Optional[Dict[str, Any]]:
         """
@@ -240,10 +284,12 @@ class JsonData:
         existing_paths = set()
         total_added = 0
         
+        # 用线程池并发读取各文件，掩盖磁盘等待；map保持原有顺序，合并仍在当前线程按序进行
+        with ThreadPoolExecutor(max_workers=min(8, len(filepaths))) as executor:
+            results = list(executor.map(read_json_file, filepaths))
+        
         # 合并文件
-        for filepath in filepaths:
-            # 读取文件
-            data, error_msg = read_json_file(filepath)
+        for data, error_msg in results:
             if error_msg:
                 continue
             
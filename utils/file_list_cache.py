@@ -0,0 +1,47 @@
+"""
+文件列表缓存模块
+
+此模块保存文件面板中的文件列表，下次启动时直接恢复，无需重新添加。
+主要功能包括：
+- 读取上次保存的文件列表
+- 保存当前文件列表
+
+列表保存在JSON缓存目录下的 file_list.pickle 中。它是用户数据而不是解析缓存，
+不受 LINKJSON_CACHE 开关影响，也不参与缓存大小清理。
+"""
+
+import os
+import pickle
+from typing import List, Tuple
+
+from utils.json_cache import CACHE_DIR, dump_pickle_atomic
+
+# 文件列表缓存路径
+FILE_LIST_PATH = os.path.join(CACHE_DIR, 'file_list.pickle')
+
+
+def load_file_list() -> List[Tuple[str, str]]:
+    """
+    读取上次保存的文件列表
+
+    Returns:
+        List[Tuple[str, str]]: [(文件名, 文件路径), ...]，没有缓存或读取失败时返回空列表
+    """
+    try:
+        with open(FILE_LIST_PATH, 'rb') as f:
+            entries = pickle.load(f)
+    except Exception:
+        return []
+    if not isinstance(entries, list):
+        return []
+    return entries
+
+
+def save_file_list(entries: List[Tuple[str, str]]) -> None:
+    """
+    保存文件列表，保存失败不影响正常流程
+
+    Args:
+        entries: [(文件名, 文件路径), ...]，按列表显示顺序排列
+    """
+    dump_pickle_atomic(FILE_LIST_PATH, entries)
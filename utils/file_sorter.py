@@ -9,9 +9,10 @@
 """
 
 import os
-import json
 from typing import Tuple, List, Dict, Any
 
+from utils.json_handler import loads_json, dumps_json
+
 
 def check_and_sort_json_file(filepath: str) -> Tuple[bool, bool, str]:
     """
@@ -27,8 +28,8 @@ def check_and_sort_json_file(filepath: str) -> Tuple[bool, bool, str]:
     """
     try:
         # 读取文件
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = loads_json(f.read())
         
         # 检查文件格式
         if not isinstance(data, dict) or 'files' not in data:
@@ -41,8 +42,9 @@ def check_and_sort_json_file(filepath: str) -> Tuple[bool, bool, str]:
             return False, True, "文件已经是有序的"
         
         # 保存排序后的文件
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(sorted_data, f, indent=2, ensure_ascii=False)
+        raw = dumps_json(sorted_data)
+        with open(filepath, 'wb') as f:
+            f.write(raw)
         
         return True, True, "文件已成功排序"
         
@@ -0,0 +1,156 @@
+"""
+JSON缓存模块
+
+此模块为较大的JSON文件提供解析结果的磁盘缓存，只在未安装orjson时使用
+（orjson解析与读取pickle一样快，缓存反而多一次写盘）。
+主要功能包括：
+- 按文件路径和修改时间读取缓存
+- 解析未命中缓存的文件后写入缓存
+- 缓存总大小超过上限时删除最久未使用的缓存
+
+缓存保存在 ~/.cache/123linkjson 下，设置环境变量 LINKJSON_CACHE=0 可关闭。
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+from typing import Any, Dict, Optional
+
+# 缓存目录
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', '123linkjson')
+
+# 小于该大小的文件直接解析更快，不做缓存
+CACHE_MIN_SIZE = 1024 * 1024
+
+# 缓存文件总大小上限，超过时从最久未使用的开始删除
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 缓存文件名：路径哈希.pickle，同目录下的其他文件不参与清理
+_ENTRY_RE = re.compile(r'[0-9a-f]{16}\.pickle')
+
+
+def _cache_enabled() -> bool:
+    """是否启用缓存"""
+    return os.environ.get('LINKJSON_CACHE', '1') != '0'
+
+
+def _cache_path(filepath: str) -> str:
+    """根据文件绝对路径生成缓存文件路径"""
+    key = hashlib.blake2b(os.path.abspath(filepath).encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.pickle")
+
+
+def _file_identity(filepath: str) -> Optional[tuple]:
+    """返回(修改时间, 文件大小)，文件过小或不存在时返回None"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    if stat.st_size < CACHE_MIN_SIZE:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def dump_pickle_atomic(path: str, obj: Any) -> bool:
+    """
+    将对象pickle后写入文件，先写临时文件再替换，避免读到写了一半的内容
+    
+    Args:
+        path: 目标文件路径
+        obj: 要保存的对象
+        
+    Returns:
+        bool: 是否写入成功，失败时不会留下临时文件
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def load_cached_json(filepath: str) -> Optional[Dict[str, Any]]:
+    """
+    读取文件对应的缓存数据
+
+    Args:
+        filepath: JSON文件路径
+
+    Returns:
+        Optional[Dict[str, Any]]: 缓存有效时返回数据，否则返回None
+    """
+    if not _cache_enabled():
+        return None
+    identity = _file_identity(filepath)
+    if identity is None:
+        return None
+    cache_path = _cache_path(filepath)
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_identity, data = pickle.load(f)
+    except Exception:
+        return None
+    # 源文件修改过则缓存失效
+    if cached_identity != identity:
+        return None
+    # 更新修改时间，清理时按最近使用排序
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return data
+
+
+def store_cached_json(filepath: str, data: Dict[str, Any]) -> None:
+    """
+    将刚解析的数据写入缓存，缓存失败不影响正常流程
+
+    Args:
+        filepath: JSON文件路径
+        data: 与文件内容一致的数据
+    """
+    if not _cache_enabled():
+        return
+    identity = _file_identity(filepath)
+    if identity is None:
+        return
+    if dump_pickle_atomic(_cache_path(filepath), (identity, data)):
+        _evict()
+
+
+def _evict() -> None:
+    """缓存总大小超过上限时，从最久未使用的缓存开始删除"""
+    entries = []
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if _ENTRY_RE.fullmatch(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    if total <= CACHE_MAX_BYTES:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= CACHE_MAX_BYTES:
+            break
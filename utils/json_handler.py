@@ -10,8 +10,82 @@ JSON处理模块
 """
 
 import json
+import mmap
 import os
-from typing import Dict, Any, Tuple, Optional, List
+from typing import BinaryIO, Dict, Any, Tuple, Optional, List
+
+from utils.json_cache import load_cached_json, store_cached_json
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时退回标准库json
+    orjson = None
+
+try:
+    import ijson
+    # 只使用C后端，纯Python后端比整体解析还慢
+    _ijson_backend = ijson.get_backend('yajl2_c')
+except ImportError:  # 未安装ijson或缺少C后端时不做流式解析
+    ijson = _ijson_backend = None
+
+# 超过该大小的文件使用流式解析
+STREAM_THRESHOLD = 50 * 1024 * 1024
+
+# 不小于该大小的文件用内存映射交给orjson解析，更小的文件映射开销大于收益
+MMAP_THRESHOLD = 64 * 1024
+
+# 各解析器抛出的格式错误
+_DECODE_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
+
+
+def loads_json(raw: bytes) -> Any:
+    """
+    解析JSON字节串，已安装orjson时优先使用
+    
+    Args:
+        raw: 文件的原始字节内容
+        
+    Returns:
+        Any: 解析后的数据
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    将数据序列化为缩进2格、不转义非ASCII字符的UTF-8字节串，已安装orjson时优先使用
+    
+    Args:
+        data: 要序列化的数据
+        
+    Returns:
+        bytes: 序列化结果
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def dump_json(data: Any, fp: BinaryIO) -> None:
+    """
+    将数据按dumps_json的格式写入以二进制模式打开的文件
+    
+    已安装orjson时整体序列化后一次写入；否则逐段编码写入，
+    不在内存中拼出完整的字符串和字节串（带缩进时标准库本就逐段编码）
+    
+    Args:
+        data: 要序列化的数据
+        fp: 以二进制模式打开的文件对象
+    """
+    if orjson is not None:
+        fp.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    write = fp.write
+    for chunk in encoder.iterencode(data):
+        write(chunk.encode('utf-8'))
 
 
 def read_json_file(filepath: str) -> Tuple[Optional[Dict[str, Any]], str]:
@@ -29,11 +103,32 @@ def read_json_file(filepath: str) -> Tuple[Optional[Dict[str, Any]], str]:
     if not os.path.exists(filepath):
         return None, f"文件不存在: {filepath}"
     
+    # 未安装orjson时解析较慢，文件未修改则直接使用上次的解析结果
+    if orjson is None:
+        data = load_cached_json(filepath)
+        if data is not None:
+            return data, ""
+    
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        size = os.path.getsize(filepath)
+        if _ijson_backend is not None and size > STREAM_THRESHOLD:
+            # 大文件按块流式解析顶层字段，不再把整个文件内容读入内存
+            with open(filepath, 'rb') as f:
+                data = dict(_ijson_backend.kvitems(f, '', use_float=True))
+        elif orjson is not None and size >= MMAP_THRESHOLD:
+            # orjson可直接解析内存映射的缓冲区，省去read()复制一份文件内容
+            with open(filepath, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                data = orjson.loads(view)
+        else:
+            # 以二进制读取整个文件后一次解析，比逐块读取文本再解析更快
+            with open(filepath, 'rb') as f:
+                data = loads_json(f.read())
+        if orjson is None:
+            store_cached_json(filepath, data)
         return data, ""
-    except json.JSONDecodeError:
+    except _DECODE_ERRORS:
         return None, "无效的JSON格式"
     except Exception as e:
         return None, f"读取文件时出错: {str(e)}"
@@ -57,8 +152,10 @@ def write_json_file(filepath: str, data: Dict[str, Any]) -> Tuple[bool, str]:
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # 先整体序列化再一次写入
+        raw = dumps_json(data)
+        with open(filepath, 'wb') as f:
+            f.write(raw)
         return True, ""
     except Exception as e:
         return False, f"写入文件时出错: {str(e)}"
@@ -1,5 +1,5 @@
 import os
-from typing import List, Dict, Any, Tuple, Optional
+from typing import Iterable, List, Dict, Any, Tuple, Optional
 import copy
 
 
@@ -49,19 +49,21 @@ def analyze_json_structure(json_data: dict) -> dict:
         'treeString': tree_string
     }
 
-def filter_json_files(json_data: dict, extensions: List[str]) -> dict:
+def filter_json_files(json_data: dict, extensions: Iterable[str]) -> dict:
     """
     按扩展名过滤文件，返回新json_data。
     extensions: 需要过滤掉的扩展名（不区分大小写，无点号）
     """
     if not extensions:
         return json_data
-    filtered = copy.deepcopy(json_data)
-    filtered['files'] = [
+    # 统一成小写集合，每个文件只做一次哈希查找
+    ext_set = frozenset(e.lower() for e in extensions)
+    files = [
         f for f in json_data['files']
-        if not ('.' in f['path'] and f['path'].split('.')[-1].lower() in extensions)
+        if not ('.' in f['path'] and f['path'].rpartition('.')[2].lower() in ext_set)
     ]
-    return filtered
+    # 文件列表整体替换，只深拷贝其余的元数据，并保持原有键顺序
+    return {k: files if k == 'files' else copy.deepcopy(v) for k, v in json_data.items()}
 
 def split_json_by_count(json_data: dict, chunk_size: int) -> List[dict]:
     """
@@ -7,7 +7,11 @@
 """
 
 import os
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
+from urllib.parse import unquote
+
+# 支持的秒链前缀，str.startswith可直接接受元组一次判断
+LINK_PREFIXES = ("123FSLink", "123FLCPV2")
 
 
 class LinkParser:
@@ -68,8 +72,6 @@ class LinkParser:
         if len(parts) < 3:
             return [], "无效FLCPV2格式: 缺少必要部分"
             
-        base_path = parts[1].replace('\\', '/').strip('/')
-        
         for part in parts[2:]:
             if not part.strip():
                 continue
@@ -78,15 +80,9 @@ class LinkParser:
                 # 分割出etag, size和完整路径部分
                 etag, size, full_path_part = part.split('#', 2)
                 # 提取真正的文件名（最后一个#之后的内容）
-                name = full_path_part.split('#')[-1].strip()
+                name = full_path_part.rpartition('#')[2].strip()
                 # 解码URL编码的特殊字符
-                try:
-                    from urllib.parse import unquote
-                    name = unquote(name)
-                except:
-                    pass
-                # 组合完整路径（确保基础路径不以/结尾）
-                clean_base = base_path.rstrip('/')
+                name = unquote(name)
                 # 直接使用提取的文件名，不拼接基础路径
                 full_path = name
                 files.append({
@@ -118,6 +114,31 @@ class LinkParser:
                 if common_path 
                 else LinkParser._generate_fslink(files))
             
+    @staticmethod
+    def generate_links(files: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """
+        为每个文件各生成一条秒链，结果与逐个调用generate_link([file])相同
+        
+        单个文件的公共路径就是其所在目录，这里直接拆分路径，
+        省去每个文件构造列表和查找公共前缀的开销
+        
+        Args:
+            files: 文件信息，每个需包含path,size,etag
+            
+        Yields:
+            str: 对应文件的秒链
+        """
+        for file in files:
+            path = file['path'].replace('\\', '/')
+            stripped = path.strip('/')
+            base_path, sep, _ = stripped.rpartition('/')
+            base_path = base_path.strip('/')
+            if sep and base_path:
+                name = stripped[len(base_path):].lstrip('/')
+                yield f"123FLCPV2${base_path}${file['etag']}#{file['size']}#{name}"
+            else:
+                yield f"123FSLinkV2${file['etag']}#{file['size']}#{path.strip()}"
+    
     @staticmethod
     def _generate_fslink(files: List[Dict[str, Any]]) -> str:
         """生成123FSLink格式链接"""
@@ -168,7 +189,7 @@ class LinkParser:
         if not link:
             return False, "链接不能为空"
             
-        if not (link.startswith("123FSLink") or link.startswith("123FLCPV2")):
+        if not link.startswith(LINK_PREFIXES):
             return False, "必须以123FSLink或123FLCPV2开头"
             
         parts = link.split('$')